@@ -1,12 +1,18 @@
 from flask import Flask, render_template
 from flask_restx import Api
 from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, get_jwt, jwt_required
 from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from app.persistence.routing import RoutingSession
+from app.persistence import fulltext
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
-db = SQLAlchemy()
+# reads may be served by read replicas (REPLICA_DATABASE_URIS), writes always hit the primary
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+# schema changes ship as Alembic revisions in migrations/ (flask db upgrade)
+migrate = Migrate()
 
 def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
@@ -16,12 +22,38 @@ def create_app(config_class="config.DevelopmentConfig"):
     bcrypt.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
+    # batch mode: SQLite can't ALTER most constraints in place
+    migrate.init_app(app, db, render_as_batch=True, include_name=fulltext.include_name)
+
+    from app.persistence.engine import configure_engines
+    from app.persistence.routing import register_replicas
+    configure_engines(app)
+    register_replicas(app)
+
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        # stale "ver" claim -> 401, answered from memory (no per-request user lookup)
+        from app.services import facade
+        return facade.is_token_revoked(jwt_payload)
 
     # ✅ Web routes FIRST
     @app.get("/ping")
     def ping():
         return "pong", 200
 
+    @app.get("/stats")
+    @jwt_required()
+    def stats():
+        """Admin only: runtime counters for monitoring (cache hit/miss, login throttling, ...)."""
+        if not get_jwt().get("is_admin", False):
+            return {"error": "Admin privileges required"}, 403
+        from app.services import facade
+        from app.services.rate_limiter import get_login_throttle
+        return {
+            "cache": facade.cache_stats(),
+            "login": get_login_throttle().stats(),
+        }, 200
+
     @app.get("/")
     def home():
         return render_template("index.html")
@@ -47,6 +79,10 @@ def create_app(config_class="config.DevelopmentConfig"):
         doc="/api/v1/"
     )
 
+    from app.api.representations import output_json
+    # orjson (or stdlib json) instead of RESTX's default encoder
+    api.representation("application/json")(output_json)
+
     from app.api.v1.auth import api as auth_ns
     from app.api.v1.users import api as users_ns
     from app.api.v1.amenities import api as amenities_ns
@@ -0,0 +1,69 @@
+"""
+application/json representation for the Flask-RESTX Api: orjson (a requirement),
+or the slower stdlib json module where it cannot be installed. Both encode
+datetimes/dates/times (ISO 8601), Decimals (as numbers) and UUIDs (as strings).
+
+Config:
+    JSON_BACKEND    None (orjson if importable), "orjson" or "json"
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+BACKENDS = ("orjson", "json")
+
+
+def _default(obj):
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_dumps(data, indent=False):
+    # orjson encodes datetimes, dates, times and UUIDs itself; default= covers the rest
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=_default, option=option)
+
+
+def _json_dumps(data, indent=False):
+    return (json.dumps(data, default=_default, indent=4 if indent else None) + "\n").encode("utf-8")
+
+
+def backend():
+    """Name of the encoder the current app uses."""
+    name = current_app.config.get("JSON_BACKEND")
+    if name is None:
+        return "orjson" if orjson is not None else "json"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON_BACKEND '{name}'")
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("JSON_BACKEND='orjson' requires the 'orjson' package")
+    return name
+
+
+def dumps(data, indent=False):
+    """Encode data to UTF-8 JSON bytes (newline-terminated) with the app's backend."""
+    if backend() == "orjson":
+        return _orjson_dumps(data, indent)
+    return _json_dumps(data, indent)
+
+
+def output_json(data, code, headers=None):
+    """Flask-RESTX representation: a response with data encoded by dumps()."""
+    resp = make_response(dumps(data, indent=current_app.debug), code)
+    resp.headers.extend(headers or {})
+    return resp
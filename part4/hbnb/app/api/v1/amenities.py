@@ -2,6 +2,9 @@ from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt
 from app.models import amenity
 from app.models.amenity import Amenity
+from app.api.v1.bulk import bulk_items, bulk_response
+from app.api.v1.conditional import entity_etag, etag_headers, not_modified
+from app.models import serializers
 from app.services import facade
 
 api = Namespace('amenities', description='Amenity operations')
@@ -35,28 +38,57 @@ class AmenityList(Resource):
             # If duplicates are handled in facade, this may raise ValueError
         try:
             new_amenity = facade.create_amenity({"name": name})
-            return {'id': new_amenity.id, 'name': new_amenity.name}, 201
+            return serializers.AMENITY(new_amenity), 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
 
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'Amenity list unchanged since the ETag sent in If-None-Match')
     def get(self):
         """Retrieve a list of all amenities"""
-        amenities = facade.get_all_amenities()
-        amenities_list = [{'id': amenity.id, 'name': amenity.name} for amenity in amenities], 200
-        return amenities_list
+        amenities_list, etag = facade.get_amenity_catalog()
+        if not_modified(etag):
+            return '', 304, etag_headers(etag)
+        return amenities_list, 200, etag_headers(etag)
 
-@api.route('/<amenity_id>')
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @api.expect([amenity_model])
+    @api.response(201, 'Amenities created (see per-item results)')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def post(self):
+        """
+        Admin only: POST /api/v1/amenities/bulk
+        """
+        claims = get_jwt()
+        if not claims.get("is_admin", False):
+            return {'error': 'Admin privileges required'}, 403
+
+        try:
+            items = bulk_items(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return bulk_response(facade.create_amenities_bulk(items))
+
+@api.route('/<int:amenity_id>')
 class AmenityResource(Resource):
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Amenity unchanged since If-None-Match / If-Modified-Since')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """Get amenity details by ID"""
-        amenity = facade.get_amenity(amenity_id)
-        if amenity:
-            return {'id': amenity.id, 'name': amenity.name}
-        return {'error': 'Amenity not found'}, 404
+        amenity, updated_at = facade.get_amenity_payload(amenity_id)
+        if not amenity:
+            return {'error': 'Amenity not found'}, 404
+
+        etag = entity_etag('amenity', amenity['id'], updated_at)
+        headers = etag_headers(etag, updated_at)
+        if not_modified(etag, updated_at):
+            return '', 304, headers
+        return amenity, 200, headers
 
     @jwt_required()
     @api.expect(amenity_model)
@@ -81,10 +113,7 @@ class AmenityResource(Resource):
             updated_amenity = facade.update_amenity(amenity_id, amenity_data)
             if not updated_amenity:
                 return {'error': 'Amenity not found'}, 404
-            return {
-                'id': updated_amenity.id,
-                'name': updated_amenity.name
-            }, 200
+            return serializers.AMENITY(updated_amenity), 200
         except ValueError as e:
             return {'error': str(e)}, 400
 
@@ -1,10 +1,12 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token, get_jwt
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity
 from flask import request, current_app
 from app.services import facade
+from app.services.rate_limiter import get_login_throttle
 
 api = Namespace('auth', description='Authentication operations')
 
+
 # Model for input validation
 login_model = api.model('Login', {
     'email': fields.String(required=True, description='User email'),
@@ -25,6 +27,14 @@ class Login(Resource):
         if not email or not password:
             return {'error': 'Invalid credentials'}, 401
 
+        # Step 0: Rate limit by IP and email BEFORE any DB lookup or bcrypt work
+        throttle = get_login_throttle()
+        allowed, retry_after = throttle.check(request.remote_addr, email)
+        if not allowed:
+            return {'error': 'Too many login attempts, try again later'}, 429, {
+                'Retry-After': str(retry_after)
+            }
+
         # Step 1: Retrieve the user based on the provided email
         user = facade.get_user_by_email(email)
 
@@ -35,13 +45,18 @@ class Login(Resource):
         except ValueError:
             ok = False
 
+        throttle.record(email, ok, verified=bool(user))
         if not ok:
             return {'error': 'Invalid credentials'}, 401
 
-        # Step 3: Create a JWT token with the user's id and is_admin flag
+        # Upgrade hashes made with an old bcrypt cost while we have the password
+        facade.rehash_password_if_needed(user, password)
+
+        # Step 3: Create a JWT token with the user's id, is_admin flag and token version
         additional_claims = {
-            "id": str(user.id),
+            "id": user.id,
             "is_admin": bool(user.is_admin),
+            "ver": user.token_version,
         }
         access_token = create_access_token(
             identity=str(user.id),
@@ -52,9 +67,9 @@ class Login(Resource):
         return {'access_token': access_token}, 200
 
 
-def jwt_user_id() -> str:
-    claims = get_jwt()
-    return claims.get("id")
+def jwt_user_id() -> int:
+    # JWT subjects are strings; convert once here so callers compare integer ids
+    return int(get_jwt_identity())
 
 
 def jwt_is_admin() -> bool:
@@ -0,0 +1,20 @@
+from flask import current_app
+
+DEFAULT_MAX_ITEMS = 1000
+
+
+def bulk_items(payload):
+    """Return the items of a bulk request body (a JSON array), raising ValueError if invalid."""
+    max_items = current_app.config.get("BULK_MAX_ITEMS", DEFAULT_MAX_ITEMS)
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Request body must be a non-empty JSON array")
+    if len(payload) > max_items:
+        raise ValueError(f"At most {max_items} items per request")
+    return payload
+
+
+def bulk_response(results):
+    """201 with per-item results if anything was created, else 400 with the errors."""
+    created = sum(1 for result in results if "id" in result)
+    body = {"created": created, "failed": len(results) - created, "results": results}
+    return body, 201 if created else 400
@@ -0,0 +1,38 @@
+from datetime import timezone
+from flask import request
+from werkzeug.http import http_date
+
+# Clients must revalidate, but may reuse their copy after a 304
+REVALIDATE = "no-cache"
+
+
+def entity_etag(kind, obj_id, updated_at):
+    """Strong ETag for one entity version, e.g. place-12-20250101120000123456."""
+    stamp = updated_at.strftime("%Y%m%d%H%M%S%f") if updated_at else "0"
+    return f"{kind}-{obj_id}-{stamp}"
+
+
+def etag_headers(etag, last_modified=None):
+    headers = {"ETag": f'"{etag}"', "Cache-Control": REVALIDATE}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(_as_utc(last_modified))
+    return headers
+
+
+def not_modified(etag, last_modified=None):
+    """
+    True when the client's cached copy is current: If-None-Match holds this ETag,
+    or (only when no If-None-Match was sent) If-Modified-Since is not older than
+    last_modified.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP dates have one-second resolution
+        return _as_utc(last_modified).replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _as_utc(dt):
+    # models store naive UTC (datetime.utcnow)
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
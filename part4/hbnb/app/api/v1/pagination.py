@@ -0,0 +1,33 @@
+from flask import request
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Swagger docs for the params every paginated list endpoint accepts
+page_params = {
+    "limit": f"Page size (default {DEFAULT_PAGE_SIZE}, max {MAX_PAGE_SIZE})",
+    "cursor": "next_cursor returned by the previous page",
+}
+
+
+def query_arg(name, cast):
+    """Read an optional query-string argument, raising ValueError on bad input."""
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return None
+    try:
+        return cast(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid value for '{name}'")
+
+
+def page_args():
+    """Return (limit, cursor) from the query string, clamped to MAX_PAGE_SIZE."""
+    limit = query_arg("limit", int)
+    cursor = query_arg("cursor", int)
+
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    elif limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE), cursor
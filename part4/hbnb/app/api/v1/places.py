@@ -1,27 +1,34 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt
+from app.api.v1.auth import jwt_user_id
+from app.api.v1.bulk import bulk_items, bulk_response
+from app.api.v1.conditional import entity_etag, etag_headers, not_modified
+from app.api.v1.pagination import page_args, page_params, query_arg
+from app.api.v1.streaming import stream_arg, stream_params, stream_response
+from app.models import serializers
 from app.services import facade
 
 api = Namespace("places", description="Place operations")
 
 # ---------- Swagger models ----------
 amenity_model = api.model("PlaceAmenity", {
-    "id": fields.String(description="Amenity ID"),
+    "id": fields.Integer(description="Amenity ID"),
     "name": fields.String(description="Name of the amenity"),
 })
 
 user_model = api.model("PlaceUser", {
-    "id": fields.String(description="User ID"),
+    "id": fields.Integer(description="User ID"),
     "first_name": fields.String(description="First name of the owner"),
     "last_name": fields.String(description="Last name of the owner"),
     "email": fields.String(description="Email of the owner"),
 })
 
 review_model = api.model("PlaceReview", {
-    "id": fields.String(description="Review ID"),
+    "id": fields.Integer(description="Review ID"),
     "text": fields.String(description="Text of the review"),
     "rating": fields.Integer(description="Rating of the place (1-5)"),
-    "user_id": fields.String(description="ID of the user"),
+    "user_id": fields.Integer(description="ID of the user"),
 })
 
 place_model = api.model("Place", {
@@ -32,7 +39,7 @@ place_model = api.model("Place", {
     "longitude": fields.Float(required=True, description="Longitude of the place"),
 
     # Your DB/model uses user_id
-    "user_id": fields.String(required=False, description="Owner user ID"),
+    "user_id": fields.Integer(required=False, description="Owner user ID"),
 
     "owner": fields.Nested(user_model, description="Owner of the place"),
     'amenities': fields.List(
@@ -42,6 +49,50 @@ place_model = api.model("Place", {
     "reviews": fields.List(fields.Nested(review_model), description="List of reviews"),
 })
 
+# ---------- Listing query params ----------
+list_params = dict(
+    page_params,
+    **stream_params,
+    min_price="Minimum price per night",
+    max_price="Maximum price per night",
+    amenity="Only places offering this amenity ID",
+    amenities="Comma-separated amenity IDs, e.g. 1,4,7",
+    amenities_match="'all' (default): places offering every one of ?amenities=; 'any': at least one",
+    sort="Order by 'rating' or 'review_count' (highest first); default is by id",
+    bbox="min_lon,min_lat,max_lon,max_lat (min_lon > max_lon crosses the antimeridian)",
+)
+
+MAX_RADIUS_KM = 500
+
+nearby_params = {
+    "lat": "Latitude of the search centre",
+    "lon": "Longitude of the search centre",
+    "radius_km": f"Search radius in km (max {MAX_RADIUS_KM})",
+    "limit": page_params["limit"],
+}
+
+
+search_params = dict(
+    page_params,
+    q="Words to find in the title or description (all must match); end a word with * for a prefix",
+)
+
+
+def _parse_ids(raw):
+    """'1,4,7' -> [1, 4, 7]"""
+    return [int(v) for v in raw.split(",")]
+
+
+def _parse_bbox(raw):
+    """'min_lon,min_lat,max_lon,max_lat' -> (min_lat, min_lon, max_lat, max_lon)"""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in raw.split(","))
+    except ValueError:
+        raise ValueError("bbox must be 'min_lon,min_lat,max_lon,max_lat'")
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise ValueError("bbox is out of range")
+    return min_lat, min_lon, max_lat, max_lon
+
 
 @api.route("/")
 class PlaceList(Resource):
@@ -51,39 +102,156 @@ class PlaceList(Resource):
     @api.response(400, "Invalid input data")
     def post(self):
         """Register a new place (auth required)"""
-        current_user_id = get_jwt_identity()
         place_data = api.payload or {}
 
         # ✅ model expects user_id, so set it
-        place_data["user_id"] = current_user_id
+        place_data["user_id"] = jwt_user_id()
 
         # (optional) prevent client from overriding user_id
         # place_data.pop("user_id", None)  # <- don't do this, we need it
         try:
             new_place = facade.create_place(place_data)
-            return new_place.to_dict(include_owner=True), 201
+            return serializers.PLACE_WITH_OWNER(new_place), 201
         except ValueError as e:
             return {"error": str(e)}, 400
 
+    @api.doc(params=list_params)
     @api.response(200, "List of places retrieved successfully")
+    @api.response(400, "Invalid query parameters")
+    def get(self):
+        """
+        Retrieve one page of places.
+        Pass the returned next_cursor as ?cursor= to fetch the following page.
+        """
+        try:
+            limit, cursor = page_args()
+            min_price = query_arg("min_price", float)
+            max_price = query_arg("max_price", float)
+            amenity_id = query_arg("amenity", int)
+            sort = query_arg("sort", str)
+            bbox = query_arg("bbox", _parse_bbox)
+            amenity_ids = query_arg("amenities", _parse_ids)
+            amenity_match = query_arg("amenities_match", str) or "all"
+            stream = stream_arg()
+
+            if stream:
+                places = facade.stream_places(
+                    cursor=cursor,
+                    min_price=min_price,
+                    max_price=max_price,
+                    amenity_id=amenity_id,
+                    sort=sort,
+                    bbox=bbox,
+                    amenity_ids=amenity_ids,
+                    amenity_match=amenity_match
+                )
+                return stream_response(places, serializers.PLACE, stream)
+
+            places, next_cursor = facade.get_places_page(
+                limit=limit,
+                cursor=cursor,
+                min_price=min_price,
+                max_price=max_price,
+                amenity_id=amenity_id,
+                sort=sort,
+                bbox=bbox,
+                amenity_ids=amenity_ids,
+                amenity_match=amenity_match
+            )
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return {
+            "places": [serializers.PLACE(p) for p in places],
+            "next_cursor": next_cursor,
+        }, 200
+
+
+@api.route("/bulk")
+class PlaceBulk(Resource):
+    @jwt_required()
+    @api.expect([place_model])
+    @api.response(201, "Places created (see per-item results)")
+    @api.response(400, "Invalid input data")
+    def post(self):
+        """Create up to BULK_MAX_ITEMS places owned by the current user in one transaction"""
+        try:
+            items = bulk_items(api.payload)
+            results = facade.create_places_bulk(jwt_user_id(), items)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        return bulk_response(results)
+
+
+@api.route("/search")
+class PlaceSearch(Resource):
+    @api.doc(params=search_params)
+    @api.response(200, "Matching places, most relevant first")
+    @api.response(400, "Invalid query parameters")
     def get(self):
-        """Retrieve a list of all places"""
-        places = facade.get_all_places() or []
-        places_list = [p.to_dict() for p in places]
-        return places_list, 200
+        """Full-text search over place titles and descriptions"""
+        try:
+            limit, cursor = page_args()
+            places, next_cursor = facade.search_places(
+                request.args.get("q", ""), limit=limit, cursor=cursor
+            )
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return {
+            "places": [serializers.PLACE(p) for p in places],
+            "next_cursor": next_cursor,
+        }, 200
 
 
-@api.route("/<place_id>")
+@api.route("/nearby")
+class PlaceNearby(Resource):
+    @api.doc(params=nearby_params)
+    @api.response(200, "Places within the radius, nearest first")
+    @api.response(400, "Invalid query parameters")
+    def get(self):
+        """Find places within radius_km of (lat, lon)"""
+        try:
+            lat = query_arg("lat", float)
+            lon = query_arg("lon", float)
+            radius_km = query_arg("radius_km", float)
+            limit, _ = page_args()
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        if lat is None or lon is None or radius_km is None:
+            return {"error": "lat, lon and radius_km are required"}, 400
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return {"error": "lat/lon out of range"}, 400
+        if not (0 < radius_km <= MAX_RADIUS_KM):
+            return {"error": f"radius_km must be between 0 and {MAX_RADIUS_KM}"}, 400
+
+        results = facade.get_places_nearby(lat, lon, radius_km, limit=limit)
+        places_list = []
+        for place, distance in results:
+            data = serializers.PLACE(place)
+            data["distance_km"] = round(distance, 3)
+            places_list.append(data)
+        return {"places": places_list}, 200
+
+
+@api.route("/<int:place_id>")
 class PlaceResource(Resource):
     @api.response(200, "Place details retrieved successfully")
+    @api.response(304, "Place unchanged since If-None-Match / If-Modified-Since")
     @api.response(404, "Place not found")
     def get(self, place_id):
         """Get place details by ID"""
-        p = facade.get_place(place_id)
-        if not p:
+        place, updated_at = facade.get_place_payload(place_id)
+        if not place:
             return {"error": "Place not found"}, 404
 
-        return p.to_dict(include_owner=True, include_amenities=True, include_reviews=True), 200
+        # updated_at also covers the owner, amenities and reviews in the payload
+        etag = entity_etag("place", place["id"], updated_at)
+        headers = etag_headers(etag, updated_at)
+        if not_modified(etag, updated_at):
+            return "", 304, headers
+        return place, 200, headers
 
 
     @jwt_required()
@@ -98,7 +266,6 @@ class PlaceResource(Resource):
         - owner can update own place
         - admin can update any place
         """
-        current_user_id = get_jwt_identity()
         claims = get_jwt()
         is_admin = bool(claims.get("is_admin", False))
 
@@ -107,7 +274,7 @@ class PlaceResource(Resource):
             return {"error": "Place not found"}, 404
 
         # ✅ ownership check uses user_id
-        if not is_admin and str(p.user_id) != str(current_user_id):
+        if not is_admin and p.user_id != jwt_user_id():
             return {"error": "Unauthorized action"}, 403
 
         place_data = api.payload or {}
@@ -120,6 +287,6 @@ class PlaceResource(Resource):
             updated_place = facade.update_place(place_id, place_data)
             if not updated_place:
                 return {"error": "Place not found"}, 404
-            return updated_place.to_dict(include_owner=True), 200
+            return serializers.PLACE_WITH_OWNER(updated_place), 200
         except ValueError as e:
             return {"error": str(e)}, 400
\ No newline at end of file
@@ -1,5 +1,11 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.api.v1.auth import jwt_user_id
+from app.api.v1.bulk import bulk_items, bulk_response
+from app.api.v1.conditional import entity_etag, etag_headers, not_modified
+from app.api.v1.pagination import page_args, page_params, query_arg
+from app.api.v1.streaming import stream_arg, stream_params, stream_response
+from app.models import serializers
 from app.services import facade
 
 api = Namespace('reviews', description='Review operations')
@@ -8,9 +14,19 @@ api = Namespace('reviews', description='Review operations')
 review_model = api.model('Review', {
     'text': fields.String(required=True, description='Text of the review'),
     'rating': fields.Integer(required=True, description='Rating of the place (1-5)'),
-    'place_id': fields.String(required=True, description='ID of the place')
+    'place_id': fields.Integer(required=True, description='ID of the place')
 })
 
+list_params = dict(
+    page_params,
+    **stream_params,
+    place_id='Only reviews of this place',
+    user_id='Only reviews written by this user',
+)
+
+# the list selects only the columns its serializer reads
+REVIEW_LIST_COLUMNS = serializers.REVIEW.fields
+
 
 @api.route('/')
 class ReviewList(Resource):
@@ -21,7 +37,7 @@ class ReviewList(Resource):
     @jwt_required()
     def post(self):
         """Register a new review"""
-        current_user_id = str(get_jwt_identity())
+        user_id = jwt_user_id()
         review_data = api.payload or {}
 
         # must exist
@@ -29,16 +45,14 @@ class ReviewList(Resource):
         if not place:
             return {'error': 'Place not found'}, 404
 
-        if str(place.user_id) == current_user_id:
+        if place.user_id == user_id:
             return {'message': 'You cannot review your own place'}, 400
 
-        all_reviews = facade.get_all_reviews()
-        for r in all_reviews:
-            if str(r.place_id) == str(review_data.get('place_id')) and str(r.user_id) == current_user_id:
-                return {'error': 'You have already reviewed this place'}, 400
+        if facade.has_reviewed(user_id, place.id):
+            return {'error': 'You have already reviewed this place'}, 400
 
         # force user_id from token
-        review_data['user_id'] = current_user_id
+        review_data['user_id'] = user_id
 
         try:
             new_review = facade.create_review(review_data)
@@ -46,49 +60,74 @@ class ReviewList(Resource):
                 return {'error': 'Invalid User or Place ID'}, 400
 
             # return using ids directly (no need for relationship loading)
-            return {
-                'id': new_review.id,
-                'text': new_review.text,
-                'rating': new_review.rating,
-                'user_id': new_review.user_id,
-                'place_id': new_review.place_id
-            }, 201
+            return serializers.REVIEW(new_review), 201
 
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.doc(params=list_params)
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid query parameters')
     def get(self):
-        """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return [
-            {
-                'id': r.id,
-                'text': r.text,
-                'rating': r.rating,
-                'user_id': r.user_id,
-                'place_id': r.place_id
-            }
-            for r in reviews
-        ], 200
-
-
-@api.route('/<review_id>')
+        """Retrieve one page of reviews, optionally filtered by place_id / user_id"""
+        try:
+            limit, cursor = page_args()
+            place_id = query_arg('place_id', int)
+            user_id = query_arg('user_id', int)
+            stream = stream_arg()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        if stream:
+            rows = facade.stream_reviews(cursor=cursor, place_id=place_id, user_id=user_id,
+                                         columns=REVIEW_LIST_COLUMNS)
+            return stream_response(rows, serializers.REVIEW, stream)
+
+        reviews, next_cursor = facade.get_reviews_page(
+            limit=limit,
+            cursor=cursor,
+            place_id=place_id,
+            user_id=user_id,
+            columns=REVIEW_LIST_COLUMNS
+        )
+        return {
+            'reviews': [serializers.REVIEW(r) for r in reviews],
+            'next_cursor': next_cursor
+        }, 200
+
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @api.expect([review_model])
+    @api.response(201, 'Reviews created (see per-item results)')
+    @api.response(400, 'Invalid input data')
+    @jwt_required()
+    def post(self):
+        """Register up to BULK_MAX_ITEMS reviews by the current user in one transaction"""
+        try:
+            items = bulk_items(api.payload)
+            results = facade.create_reviews_bulk(jwt_user_id(), items)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return bulk_response(results)
+
+
+@api.route('/<int:review_id>')
 class ReviewResource(Resource):
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(304, 'Review unchanged since If-None-Match / If-Modified-Since')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """Get review details by ID"""
         r = facade.get_review(review_id)
         if not r:
             return {'message': 'Review not found'}, 404
-        return {
-            'id': r.id,
-            'text': r.text,
-            'rating': r.rating,
-            'user_id': r.user_id,
-            'place_id': r.place_id
-        }, 200
+
+        etag = entity_etag('review', r.id, r.updated_at)
+        headers = etag_headers(etag, r.updated_at)
+        if not_modified(etag, r.updated_at):
+            return '', 304, headers
+        return serializers.REVIEW(r), 200, headers
 
     @api.expect(review_model)  # still only text/rating/place_id allowed from client
     @api.response(200, 'Review updated successfully')
@@ -97,13 +136,12 @@ class ReviewResource(Resource):
     @jwt_required()
     def put(self, review_id):
         """Update a review's information"""
-        current_user_id = str(get_jwt_identity())
         r = facade.get_review(review_id)
         if not r:
             return {'message': 'Review not found'}, 404
 
         # only the author can edit
-        if str(r.user_id) != current_user_id:
+        if r.user_id != jwt_user_id():
             return {'message': 'Unauthorized action'}, 400
 
         review_data = api.payload or {}
@@ -124,13 +162,12 @@ class ReviewResource(Resource):
     @jwt_required()
     def delete(self, review_id):
         """Delete a review"""
-        current_user_id = str(get_jwt_identity())
         r = facade.get_review(review_id)
         if not r:
             return {'message': 'Review not found'}, 404
 
         # only the author can delete
-        if str(r.user_id) != current_user_id:
+        if r.user_id != jwt_user_id():
             return {'message': 'Unauthorized action'}, 400
 
         facade.delete_review(review_id)
@@ -0,0 +1,56 @@
+from flask import Response, stream_with_context
+
+from app.api.representations import dumps
+from app.api.v1.pagination import query_arg
+
+# ?stream= value -> response mimetype
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",  # one JSON object per line
+    "json": "application/json",        # one JSON array, sent in chunks
+}
+
+# rows serialized per chunk written to the socket
+CHUNK_ROWS = 100
+
+stream_params = {
+    "stream": "'ndjson' or 'json': send every matching row (from ?cursor= on) as it is "
+              "read instead of one page; limit is ignored",
+}
+
+
+def stream_arg():
+    """Return the requested stream format (None for a normal paged response)."""
+    fmt = query_arg("stream", str)
+    if fmt is not None and fmt not in STREAM_FORMATS:
+        raise ValueError(f"stream must be one of: {', '.join(STREAM_FORMATS)}")
+    return fmt
+
+
+def stream_response(rows, serialize, fmt):
+    """
+    Chunked response writing serialize(row) for each row as the iterator yields it,
+    so memory stays flat however many rows there are. The request context (and so
+    the DB session the rows come from) lives until the last chunk is sent.
+    """
+    def ndjson():
+        chunk = []
+        for row in rows:
+            # dumps() ends each document with a newline
+            chunk.append(dumps(serialize(row)))
+            if len(chunk) >= CHUNK_ROWS:
+                yield b"".join(chunk)
+                chunk = []
+        if chunk:
+            yield b"".join(chunk)
+
+    def json_array():
+        yield b"["
+        separator = b""
+        for lines in ndjson():
+            # each chunk is complete lines: join them as array items instead
+            yield separator + b",".join(lines.splitlines())
+            separator = b","
+        yield b"]\n"
+
+    body = ndjson() if fmt == "ndjson" else json_array()
+    return Response(stream_with_context(body), mimetype=STREAM_FORMATS[fmt])
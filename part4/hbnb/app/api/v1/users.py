@@ -1,6 +1,10 @@
 from flask_restx import Namespace, Resource, fields
+from app.api.v1.conditional import entity_etag, etag_headers, not_modified
+from app.api.v1.streaming import stream_arg, stream_params, stream_response
+from app.models import serializers
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app.api.v1.auth import jwt_user_id
 
 
 api = Namespace('users', description='User operations')
@@ -19,6 +23,9 @@ user_update_model = api.model('UserUpdate', {
     'password': fields.String(description='Password (admin only)')
 })
 
+# the list selects only the columns its serializer reads
+USER_LIST_COLUMNS = serializers.USER_PUBLIC.fields
+
 @api.route('/protected')
 class ProtectedResource(Resource):
     @jwt_required()
@@ -34,15 +41,22 @@ class ProtectedResource(Resource):
 
 @api.route('/')
 class UserList(Resource):
+    @api.doc(params=stream_params)
     @api.response(200, 'Users successfully retrieved')
+    @api.response(400, 'Invalid query parameters')
     def get(self):
         """Get all users"""
-        users = facade.get_all_users()
-        users_list = [
-            {'id': user.id, 'first_name': user.first_name, 'last_name': user.last_name}
-            for user in users
-            ]
-        return users_list, 200
+        try:
+            stream = stream_arg()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # only the listed columns are selected: no password hashes, no ORM objects
+        if stream:
+            users = facade.stream_users(columns=USER_LIST_COLUMNS)
+            return stream_response(users, serializers.USER_PUBLIC, stream)
+        users = facade.get_all_users(columns=USER_LIST_COLUMNS)
+        return [serializers.USER_PUBLIC(user) for user in users], 200
 
     @jwt_required()
     @api.expect(user_model, validate=True)
@@ -73,20 +87,22 @@ class UserList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
-@api.route('/<user_id>')
+@api.route('/<int:user_id>')
 class UserResource(Resource):
     @api.response(200, 'User successfully retrieved')
+    @api.response(304, 'User unchanged since If-None-Match / If-Modified-Since')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """Get a user by id"""
-        user = facade.get_user(user_id)
+        user, updated_at = facade.get_user_payload(user_id)
         if not user:
             return {'error': 'User not found'}, 404
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name
-        }, 200
+
+        etag = entity_etag('user', user['id'], updated_at)
+        headers = etag_headers(etag, updated_at)
+        if not_modified(etag, updated_at):
+            return '', 304, headers
+        return user, 200, headers
     @jwt_required()
     @api.expect(user_update_model, validate=True)
     @api.response(200, 'User successfully updated')
@@ -101,11 +117,10 @@ class UserResource(Resource):
         """
         claims = get_jwt()
         is_admin = bool(claims.get("is_admin", False))
-        current_user_id = get_jwt_identity()
 
         user_data = api.payload
         # If not admin, only self-update
-        if not is_admin and str(user_id) != str(current_user_id):
+        if not is_admin and user_id != jwt_user_id():
             return {'error': 'Unauthorized action'}, 403
 
         # If not admin, block email/password changes
@@ -118,7 +133,7 @@ class UserResource(Resource):
                 return {'error': 'Email cannot be empty'}, 400
 
             existing_user = facade.get_user_by_email(new_email)
-            if existing_user and str(existing_user.id) != str(user_id):
+            if existing_user and existing_user.id != user_id:
                 return {'error': 'Email already in use'}, 400
 
             user_data['email'] = new_email
@@ -126,12 +141,7 @@ class UserResource(Resource):
             updated_user = facade.update_user(user_id, user_data)
             if not updated_user:
                 return {'error': 'User not found'}, 404
-            return {
-                'id': updated_user.id,
-                'first_name': updated_user.first_name,
-                'last_name': updated_user.last_name,
-                'email': updated_user.email
-            }, 200
+            return serializers.USER_CONTACT(updated_user), 200
         except ValueError as e:
             return {'error': str(e)}, 400
 
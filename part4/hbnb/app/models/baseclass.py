@@ -1,11 +1,12 @@
 from app import db
-import uuid
 from datetime import datetime
 
 class BaseModel(db.Model):
     __abstract__ = True  # This ensures SQLAlchemy does not create a table for BaseModel
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # integer surrogate key for every table: compact joins and indexes, and the
+    # same type in URLs, JSON payloads, foreign keys and JWT subjects
+    id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,17 +1,34 @@
+from sqlalchemy.ext.hybrid import hybrid_property
 from app import db
 from app.models.baseclass import BaseModel
+from app.persistence import fulltext
 
 # Association table
 place_amenity = db.Table(
     "place_amenity",
     db.Column("place_id", db.Integer, db.ForeignKey("places.id"), primary_key=True),
     db.Column("amenity_id", db.Integer, db.ForeignKey("amenities.id"), primary_key=True),
+    # the primary key leads with place_id; this serves "places with amenity X"
+    db.Index("ix_place_amenity_amenity_id", "amenity_id"),
 )
 
+# Mean rating (unrated places sort as 0). Kept as literal SQL so the ORDER BY
+# emitted for ?sort=rating is textually identical to the expression index below.
+AVERAGE_RATING_SQL = "coalesce(CAST(rating_sum AS FLOAT) / nullif(review_count, 0), 0)"
+
 class Place(BaseModel):
     __tablename__ = "places"
+    __table_args__ = (
+        # back the rating / popularity sort orders of the place listing
+        db.Index("ix_places_review_count", "review_count"),
+        db.Index("ix_places_average_rating", db.text(AVERAGE_RATING_SQL)),
+        # bounding-box range scans (?bbox= on the listing)
+        db.Index("ix_places_latitude_longitude", "latitude", "longitude"),
+        # ownership lookups and ?min_price= / ?max_price= range filters
+        db.Index("ix_places_user_id", "user_id"),
+        db.Index("ix_places_price", "price"),
+    )
 
-    id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(1024))
     price = db.Column(db.Float, nullable=False)
@@ -20,16 +37,20 @@ class Place(BaseModel):
 
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
+    # Denormalized review aggregates, kept in step by HBnBFacade's review methods
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     owner = db.relationship(
         "User",
         back_populates="places",
         foreign_keys=[user_id]
     )
 
+    # plain list (not lazy="dynamic") so it can be eager-loaded by get_place_detail
     reviews = db.relationship(
         "Review",
         backref="place",
-        lazy="dynamic",
         cascade="all, delete-orphan"
     )
 
@@ -39,40 +60,17 @@ class Place(BaseModel):
         back_populates="places"
     )
 
-    def to_dict(self, include_owner=False, include_amenities=False, include_reviews=False):
-        data = {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "price": self.price,
-            "latitude": self.latitude,
-            "longitude": self.longitude,
-            "user_id": self.user_id,
-        }
+    @hybrid_property
+    def average_rating(self):
+        """Mean review rating, or None when the place has no reviews."""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
 
-        if include_owner:
-            data["owner"] = None if not self.owner else {
-                "id": self.owner.id,
-                "first_name": self.owner.first_name,
-                "last_name": self.owner.last_name,
-                "email": self.owner.email,
-            }
+    @average_rating.expression
+    def average_rating(cls):
+        return db.literal_column(AVERAGE_RATING_SQL, type_=db.Float)
 
-        if include_amenities:
-            data["amenities"] = [
-                {"id": a.id, "name": a.name} for a in (self.amenities or [])
-            ]
 
-        if include_reviews:
-            all_reviews = self.reviews.all()
-            data["reviews"] = [
-                {
-                    "id": r.id,
-                    "text": r.text,
-                    "rating": r.rating,
-                    "user_id": r.user_id,
-                    "user_name": f"{r.user.first_name} {r.user.last_name}"
-                }
-                for r in all_reviews
-            ]
-        return data
\ No newline at end of file
+# title/description full-text index (SQLite FTS5), maintained by triggers
+fulltext.register(Place.__table__)
@@ -3,16 +3,14 @@ from app.models.baseclass import BaseModel
 
 class Review(BaseModel):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # one review per user per place (also indexes lookups by user_id)
+        db.UniqueConstraint("user_id", "place_id", name="uq_reviews_user_id_place_id"),
+        # serves "reviews of this place" listings in keyset (id) order: no scan, no sort
+        db.Index("ix_reviews_place_id_id", "place_id", "id"),
+    )
 
-    id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.String(2048), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     place_id = db.Column(db.Integer, db.ForeignKey('places.id'), nullable=False)
-
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "text": self.text,
-            "rating": self.rating,
-        }
@@ -0,0 +1,97 @@
+"""
+Compiled serializers: one function per (model, field set), shared by every endpoint.
+
+Each view is compiled once, at import, into a specialized function whose body is a
+single dict display ({"id": obj.id, "title": obj.title, ...}) rather than a loop
+over field names. The functions only use attribute access, so they take ORM
+objects and Row tuples from column projections (repository columns=...) alike;
+`serializer.fields` lists the keys, e.g. to select exactly those columns.
+
+A field is an attribute name, or a (key, function) pair for computed or nested
+values; related() and related_list() build the nested ones.
+"""
+import keyword
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+_compiled = {}  # (model, fields) -> function
+
+
+def compile_serializer(model, fields):
+    """Return the serializer of `model` for `fields`, compiling it on first request."""
+    key = (model, tuple(fields))
+    serialize = _compiled.get(key)
+    if serialize is None:
+        serialize = _compiled.setdefault(key, _compile(model, key[1]))
+    return serialize
+
+
+def _compile(model, fields):
+    namespace = {}
+    items = []
+    for i, field in enumerate(fields):
+        if isinstance(field, str):
+            if (not field.isidentifier() or keyword.iskeyword(field) or field.startswith("_")
+                    or not hasattr(model, field)):
+                raise ValueError(f"{model.__name__} has no field '{field}'")
+            items.append(f"{field!r}: obj.{field}")
+        else:
+            name, function = field
+            namespace[f"_field{i}"] = function
+            items.append(f"{name!r}: _field{i}(obj)")
+
+    name = f"serialize_{model.__name__.lower()}"
+    source = f"def {name}(obj):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<serializer {model.__name__}>", "exec"), namespace)
+    serialize = namespace[name]
+    serialize.fields = tuple(f if isinstance(f, str) else f[0] for f in fields)
+    return serialize
+
+
+def related(attr, serialize):
+    """Field function: serialize(obj.<attr>), or None when there is no related object."""
+    def field(obj):
+        value = getattr(obj, attr)
+        return None if value is None else serialize(value)
+    return field
+
+
+def related_list(attr, serialize):
+    """Field function: [serialize(item) for item in obj.<attr>]."""
+    def field(obj):
+        return [serialize(item) for item in getattr(obj, attr) or ()]
+    return field
+
+
+# ---------- Views ----------
+AMENITY = compile_serializer(Amenity, ("id", "name"))
+
+# what anyone may see about a user
+USER_PUBLIC = compile_serializer(User, ("id", "first_name", "last_name"))
+USER_CONTACT = compile_serializer(User, ("id", "first_name", "last_name", "email"))
+
+REVIEW = compile_serializer(Review, ("id", "text", "rating", "user_id", "place_id"))
+
+# a review inside its place's detail payload (the place is implied)
+PLACE_REVIEW = compile_serializer(Review, (
+    "id", "text", "rating", "user_id",
+    ("user_name", lambda r: f"{r.user.first_name} {r.user.last_name}"),
+))
+
+_PLACE_FIELDS = (
+    "id", "title", "description", "price", "latitude", "longitude", "user_id",
+    ("review_count", lambda p: p.review_count or 0),
+    "average_rating",
+)
+_OWNER = ("owner", related("owner", USER_CONTACT))
+
+PLACE = compile_serializer(Place, _PLACE_FIELDS)
+PLACE_WITH_OWNER = compile_serializer(Place, _PLACE_FIELDS + (_OWNER,))
+PLACE_DETAIL = compile_serializer(Place, _PLACE_FIELDS + (
+    _OWNER,
+    ("amenities", related_list("amenities", AMENITY)),
+    ("reviews", related_list("reviews", PLACE_REVIEW)),
+))
@@ -1,15 +1,17 @@
-from app import db, bcrypt
+from app import db
+from app import passwords
 from app.models.baseclass import BaseModel  # Import BaseModel from its module
 
 class User(BaseModel):
     __tablename__ = "users"
 
-    id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
     email = db.Column(db.String(120), nullable=False, unique=True)
     password = db.Column(db.String(128), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
+    # Bumped to revoke every token issued before (embedded in JWTs as "ver")
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
 
     places = db.relationship(
@@ -28,18 +30,12 @@ class User(BaseModel):
 
     def hash_password(self, password):
         """Hash the password before storing it."""
-        self.password = bcrypt.generate_password_hash(password).decode("utf-8")
+        self.password = passwords.hash_password(password)
 
     def verify_password(self, password):
         """Verify the hashed password."""
-        return bcrypt.check_password_hash(self.password, password)
-
-    def to_dict(self):
-        """Return a dict representation of the object."""
-        return {
-            "id": self.id,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "email": self.email,
-            "is_admin": self.is_admin,
-        }
\ No newline at end of file
+        return passwords.check_password(self.password, password)
+
+    def password_needs_rehash(self):
+        """True when the stored hash uses a different bcrypt cost than configured."""
+        return passwords.needs_rehash(self.password)
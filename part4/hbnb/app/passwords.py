@@ -0,0 +1,72 @@
+"""
+Password hashing (bcrypt) with a configurable cost and an optional worker pool.
+
+Config:
+    BCRYPT_LOG_ROUNDS        bcrypt cost factor for new hashes (default 12)
+    PASSWORD_HASH_EXECUTOR   None (hash on the request thread), "thread" or "process"
+    PASSWORD_HASH_WORKERS    pool size (default: CPU count)
+
+The pool bounds how many bcrypt computations run at once, so a login burst
+uses every core without starving other endpoints of CPU.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+from flask import current_app
+
+DEFAULT_ROUNDS = 12
+_COST_RE = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _check(pw_hash, password):
+    return bcrypt.checkpw(password.encode("utf-8"), pw_hash.encode("utf-8"))
+
+
+def _run(fn, *args):
+    executor = _executor()
+    if executor is None:
+        return fn(*args)
+    return executor.submit(fn, *args).result()
+
+
+def _executor():
+    extensions = current_app.extensions
+    if "hbnb_password_executor" not in extensions:
+        kind = current_app.config.get("PASSWORD_HASH_EXECUTOR")
+        workers = current_app.config.get("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1
+        if kind == "thread":
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        elif kind == "process":
+            executor = ProcessPoolExecutor(max_workers=workers)
+        elif kind is None:
+            executor = None
+        else:
+            raise ValueError(f"Unknown PASSWORD_HASH_EXECUTOR '{kind}'")
+        extensions["hbnb_password_executor"] = executor
+    return extensions["hbnb_password_executor"]
+
+
+def rounds():
+    return current_app.config.get("BCRYPT_LOG_ROUNDS", DEFAULT_ROUNDS)
+
+
+def hash_password(password):
+    """Return a bcrypt hash of `password` at the configured cost."""
+    return _run(_hash, password, rounds())
+
+
+def check_password(pw_hash, password):
+    """Verify `password` against `pw_hash`. Raises ValueError on a malformed hash."""
+    return _run(_check, pw_hash, password)
+
+
+def needs_rehash(pw_hash):
+    """True when `pw_hash` was made with a cost other than the configured one."""
+    match = _COST_RE.match(pw_hash or "")
+    return match is not None and int(match.group(1)) != rounds()
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from app.persistence.repository import after_commit
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, max_entries=10000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+            }
+
+
+class RedisCache:
+    """
+    Cache backed by any Redis-protocol server (Redis, Valkey, KeyDB, ...), so several
+    workers share entries and invalidations. Requires the optional `redis` package.
+    """
+
+    def __init__(self, url, ttl=60, prefix="hbnb:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_TYPE='redis' requires the 'redis' package")
+
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value):
+        self._client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self._client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+
+class NullCache:
+    """CACHE_TYPE='none': every lookup misses and nothing is stored."""
+
+    def __init__(self):
+        self.misses = 0
+
+    def get(self, key):
+        self.misses += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {"backend": "none", "hits": 0, "misses": self.misses}
+
+
+def get_cache():
+    """Return the cache backend of the current app, creating it from config on first use."""
+    cache = current_app.extensions.get("hbnb_cache")
+    if cache is None:
+        config = current_app.config
+        cache_type = config.get("CACHE_TYPE", "memory")
+        ttl = config.get("CACHE_TTL", 60)
+
+        if cache_type == "memory":
+            cache = MemoryCache(config.get("CACHE_MAX_ENTRIES", 10000), ttl)
+        elif cache_type == "redis":
+            cache = RedisCache(config["CACHE_REDIS_URL"], ttl)
+        elif cache_type == "none":
+            cache = NullCache()
+        else:
+            raise ValueError(f"Unknown CACHE_TYPE '{cache_type}'")
+        current_app.extensions["hbnb_cache"] = cache
+    return cache
+
+
+class VersionedSnapshot:
+    """
+    Process-wide snapshot of a small, rarely-changing result (e.g. the amenity catalog).
+    Writers in this process call bump(); the next get() rebuilds. Writes through other
+    workers are not seen until the snapshot is `ttl` seconds old and rebuilt, so that
+    is the bound on how stale it can be. Each snapshot carries a strong ETag derived
+    from its content, so workers holding the same data send the same ETag.
+    """
+
+    def __init__(self, build, ttl=60):
+        self._build = build
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.version = 0
+        self._snapshot = None  # (version, payload, etag, built_at)
+
+    def get(self):
+        """Return (payload, etag, version), rebuilding after a write or once expired."""
+        snapshot = self._snapshot
+        if (snapshot is None or snapshot[0] != self.version
+                or snapshot[3] + self.ttl <= time.monotonic()):
+            version = self.version
+            payload = self._build()
+            body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+            etag = hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+            snapshot = (version, payload, etag, time.monotonic())
+            with self._lock:
+                # a bump() during the build leaves this snapshot stale for the next reader
+                if version == self.version:
+                    self._snapshot = snapshot
+        return snapshot[1], snapshot[2], snapshot[0]
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+
+
+def get_snapshot(name, build):
+    """Return the current app's VersionedSnapshot called `name`, creating it on first use."""
+    snapshots = current_app.extensions.setdefault("hbnb_snapshots", {})
+    snapshot = snapshots.get(name)
+    if snapshot is None:
+        ttl = current_app.config.get("SNAPSHOT_TTL", 60)
+        snapshot = snapshots.setdefault(name, VersionedSnapshot(build, ttl))
+    return snapshot
+
+
+class CachedRepository:
+    """
+    Read-through cache decorator around a repository. Serialized payloads (dicts) are
+    cached per entity id and per "view" (e.g. a place's detail payload); update and
+    delete through this wrapper drop every cached view of that id. All other
+    repository methods are delegated unchanged.
+    """
+
+    def __init__(self, repo, namespace, views=("default",)):
+        self._repo = repo
+        self.namespace = namespace
+        # declared up front so invalidation also reaches entries other workers cached
+        self.views = tuple(views)
+
+    def __getattr__(self, name):
+        return getattr(self._repo, name)
+
+    def _key(self, obj_id, view):
+        return f"{self.namespace}:{obj_id}:{view}"
+
+    def get_payload(self, obj_id, serialize, view="default", load=None):
+        """
+        Return the cached payload for obj_id, or load the object (with `load`,
+        default repo.get), serialize it and cache the result. None if not found.
+        """
+        if view not in self.views:
+            raise ValueError(f"Unknown cache view '{view}' for {self.namespace}")
+        cache = get_cache()
+        key = self._key(obj_id, view)
+
+        payload = cache.get(key)
+        if payload is None:
+            obj = (load or self._repo.get)(obj_id)
+            if obj is None:
+                return None
+            payload = serialize(obj)
+            # only cache under the canonical id, so invalidate(obj.id) always finds it
+            if obj.id == obj_id:
+                cache.set(key, payload)
+        return payload
+
+    def invalidate(self, *obj_ids):
+        """Drop every cached view of obj_ids, once the current unit of work commits."""
+        keys = [self._key(obj_id, view) for obj_id in obj_ids for view in self.views]
+        # deferred so a reader cannot re-cache the pre-commit row in between
+        after_commit(lambda: get_cache().delete(*keys))
+
+    def update(self, obj_id, data):
+        updated = self._repo.update(obj_id, data)
+        if updated:
+            self.invalidate(updated.id)
+        return updated
+
+    def delete(self, obj_id):
+        obj = self._repo.get(obj_id)
+        deleted = self._repo.delete(obj_id)
+        if deleted and obj is not None:
+            self.invalidate(obj.id)
+        return deleted
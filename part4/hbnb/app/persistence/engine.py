@@ -0,0 +1,42 @@
+import sqlalchemy as sa
+from sqlalchemy import event
+
+from app import db
+
+
+def configure_engines(app):
+    """
+    Create the read-replica engines (REPLICA_DATABASE_URIS) and apply
+    SQLITE_PRAGMAS to every new connection of the app's SQLite engines.
+    PRAGMAs such as synchronous, mmap_size or busy_timeout are per connection, so
+    they are set from the pool's "connect" event rather than once at startup.
+    """
+    options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})
+    # kept out of SQLALCHEMY_BINDS: no models live there, they only mirror the primary
+    replicas = [
+        sa.create_engine(uri, **options)
+        for uri in app.config.get("REPLICA_DATABASE_URIS") or ()
+    ]
+    app.extensions["hbnb_replica_engines"] = replicas
+
+    pragmas = app.config.get("SQLITE_PRAGMAS")
+    if not pragmas:
+        return
+
+    with app.app_context():
+        engines = list(db.engines.values()) + replicas
+
+    for engine in engines:
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", _pragma_setter(pragmas))
+
+
+def _pragma_setter(pragmas):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    return set_pragmas
@@ -0,0 +1,68 @@
+"""
+SQLite FTS5 full-text index over place titles and descriptions.
+
+places_fts is an external-content FTS5 table: it stores only the inverted index
+and reads the text back from `places`. Triggers on `places` keep it in step with
+every write path (ORM, bulk inserts, raw SQL), so callers have nothing to maintain.
+Other databases get neither the table nor the triggers.
+"""
+import re
+
+from sqlalchemy import DDL, event
+
+FTS_TABLE = "places_fts"
+
+CREATE_STATEMENTS = (
+    # prefix indexes make 2- and 3-character prefix queries ("lo*") index lookups
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, content='places', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON places BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON places BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    # only text changes reindex: review writes update the rating columns constantly
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON places BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+)
+
+_TOKEN_RE = re.compile(r"\w+\*?")
+
+
+def register(table):
+    """Create the index and triggers right after `table` (places), drop them after it."""
+    for statement in CREATE_STATEMENTS:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        table, "after_drop",
+        DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+    )
+
+
+def include_name(name, type_, parent_names):
+    """Alembic autogenerate filter: the FTS table and its shadow tables are not models."""
+    return not (type_ == "table" and name is not None and name.startswith(FTS_TABLE))
+
+
+def match_query(text):
+    """
+    Turn user input into an FTS5 MATCH expression: every word must match, and a
+    word ending in * matches as a prefix ("sea vie*"). Operators and quotes in the
+    input are never interpreted, so it cannot produce an FTS5 syntax error.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(text or ""):
+        word = token.rstrip("*")
+        terms.append(f'"{word}"*' if token.endswith("*") else f'"{word}"')
+    if not terms:
+        raise ValueError("q must contain at least one word")
+    return " ".join(terms)
@@ -1,5 +1,62 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from app import db
+from app.persistence.routing import pin_to_primary
+
+# db.session.info keys of the current unit of work
+_UOW_DEPTH = "hbnb_uow_depth"
+_UOW_CALLBACKS = "hbnb_uow_after_commit"
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Group repository writes into one transaction. Inside the block add/update/delete
+    only flush (ids are assigned, nothing is committed); the outermost block commits
+    once on success and rolls everything back on an exception. Nested blocks join
+    the outer unit. Reads inside a unit go to the primary database.
+    """
+    info = db.session.info
+    depth = info.get(_UOW_DEPTH, 0)
+    if depth == 0:
+        # read-modify-write must see the primary's rows, not a lagging replica's
+        pin_to_primary(db.session())
+    info[_UOW_DEPTH] = depth + 1
+    try:
+        yield
+    except Exception:
+        if depth == 0:
+            info.pop(_UOW_CALLBACKS, None)
+            db.session.rollback()
+        raise
+    else:
+        if depth == 0:
+            try:
+                db.session.commit()
+            except Exception:
+                info.pop(_UOW_CALLBACKS, None)
+                db.session.rollback()
+                raise
+            for callback in info.pop(_UOW_CALLBACKS, ()):
+                callback()
+    finally:
+        info[_UOW_DEPTH] = depth
+
+
+def in_unit_of_work():
+    return db.session.info.get(_UOW_DEPTH, 0) > 0
+
+
+def after_commit(callback):
+    """
+    Run callback() once the current unit of work commits (dropped on rollback), or
+    right away outside a unit. For side effects outside the DB: caches, indexes...
+    """
+    if in_unit_of_work():
+        db.session.info.setdefault(_UOW_CALLBACKS, []).append(callback)
+    else:
+        callback()
+
 
 class Repository(ABC):
     @abstractmethod
@@ -59,20 +116,110 @@ class SQLAlchemyRepository(Repository):
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        self._commit()
+
+    def add_mappings(self, rows):
+        """
+        Insert plain dicts (column -> value) with one executemany INSERT in a single
+        transaction (or the current unit of work), without building ORM objects.
+        Return the new ids in row order.
+        """
+        if not rows:
+            return []
+        try:
+            ids = self._insert_mappings(rows)
+        except Exception:
+            if not in_unit_of_work():
+                db.session.rollback()
+            raise
+        self._commit()
+        return ids
 
     def get(self, obj_id):
         return self.model.query.get(obj_id)
 
-    def get_all(self):
+    def get_all(self, columns=None):
+        """
+        Every row as an ORM object, or with `columns` (attribute names) as lightweight
+        Row named tuples holding only those columns: no identity map, no unused data.
+        """
+        if columns:
+            # ordered explicitly: a covering index (e.g. a unique name) would reorder the rows
+            return db.session.query(*self._columns(columns)).order_by(self.model.id).all()
         return self.model.query.all()
 
+    def get_many(self, obj_ids):
+        """Fetch several objects with a single IN (...) query (order not guaranteed)."""
+        if not obj_ids:
+            return []
+        return self.model.query.filter(self.model.id.in_(obj_ids)).all()
+
+    def get_page(self, limit, cursor=None, columns=None, **filters):
+        """Return (objects, next_cursor) for one keyset page matching the equality filters."""
+        return self._keyset_page(
+            self.model.query.filter_by(**filters), limit, cursor, columns=columns
+        )
+
+    def stream(self, cursor=None, columns=None, batch_size=1000, **filters):
+        """
+        Iterate every row matching the equality filters (after `cursor`, in page order),
+        fetching `batch_size` rows at a time so memory stays flat however many match.
+        """
+        return self._keyset_stream(
+            self.model.query.filter_by(**filters), cursor, columns=columns, batch_size=batch_size
+        )
+
+    def _keyset_page(self, query, limit, cursor=None, sort_key=None, columns=None):
+        """
+        Keyset pagination: seek past the cursor instead of OFFSET-scanning skipped rows.
+        The cursor is always the id of the last row returned. With `sort_key`, rows are
+        ordered by that column/expression descending and ties are broken by id.
+        With `columns`, the page holds Row tuples of those columns (id always included).
+        """
+        query = self._seek(self._project(query, columns), cursor, sort_key)
+
+        # fetch one extra row to know whether another page exists
+        rows = query.limit(limit + 1).all()
+        page = rows[:limit]
+        next_cursor = page[-1].id if len(rows) > limit else None
+        return page, next_cursor
+
+    def _keyset_stream(self, query, cursor=None, sort_key=None, columns=None, batch_size=1000):
+        """_keyset_page without the limit: an iterator reading batch_size rows at a time."""
+        query = self._seek(self._project(query, columns), cursor, sort_key)
+        # executed now so bad arguments raise here, not halfway through a response
+        return iter(query.yield_per(batch_size))
+
+    def _project(self, query, columns):
+        if not columns:
+            return query
+        names = list(columns) if "id" in columns else ["id", *columns]
+        return query.with_entities(*self._columns(names))
+
+    def _seek(self, query, cursor, sort_key):
+        """Order the query (by sort_key descending then id, or by id) and skip past the cursor."""
+        model_id = self.model.id
+        if sort_key is None:
+            if cursor is not None:
+                query = query.filter(model_id > cursor)
+            return query.order_by(model_id)
+
+        if cursor is not None:
+            last_key = (
+                db.session.query(sort_key).filter(model_id == cursor).scalar_subquery()
+            )
+            query = query.filter(db.or_(
+                sort_key < last_key,
+                db.and_(sort_key == last_key, model_id > cursor)
+            ))
+        return query.order_by(sort_key.desc(), model_id)
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            self._commit()
             return obj
         return None
 
@@ -80,9 +227,39 @@ class SQLAlchemyRepository(Repository):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            self._commit()
             return True
         return False
 
     def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
\ No newline at end of file
+        return self.model.query.filter_by(**{attr_name: attr_value}).first()
+
+    def get_many_by_attribute(self, attr_name, values):
+        """Objects whose attr_name is any of `values`, in one IN (...) query."""
+        if not values:
+            return []
+        return self.model.query.filter(getattr(self.model, attr_name).in_(values)).all()
+
+    def _columns(self, names):
+        column_attrs = self.model.__mapper__.column_attrs
+        for name in names:
+            if name not in column_attrs:
+                raise ValueError(f"Unknown column '{name}' for {self.model.__name__}")
+        return [getattr(self.model, name) for name in names]
+
+    def _insert_mappings(self, rows):
+        # staged only: callers commit (subclasses add related rows first)
+        statement = db.insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        return list(db.session.execute(statement, rows).scalars())
+
+    def _commit(self):
+        # inside a unit of work only flush: unit_of_work() commits or rolls back
+        if in_unit_of_work():
+            db.session.flush()
+            return
+        # leave the session usable (e.g. after an IntegrityError) before re-raising
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
\ No newline at end of file
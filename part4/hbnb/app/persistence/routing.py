@@ -0,0 +1,76 @@
+"""
+Primary / read-replica routing for db.session.
+
+Replicas are the engines built from REPLICA_DATABASE_URIS. A session reads
+from one replica (picked at random, kept for the whole request) until it writes
+or enters a unit of work; from then on every statement goes to the primary, so
+the request reads its own writes. After a write the client also gets a short
+cookie that keeps its next requests on the primary while replicas catch up.
+"""
+import random
+
+import sqlalchemy as sa
+from flask import current_app, request
+from flask_sqlalchemy.session import Session
+
+_PINNED = "hbnb_primary_pinned"
+_WROTE = "hbnb_primary_wrote"
+_REPLICA = "hbnb_replica"
+
+STICKY_COOKIE = "hbnb_primary"
+
+
+class RoutingSession(Session):
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, sa.UpdateBase):
+                self.info[_WROTE] = self.info[_PINNED] = True
+            elif not self.info.get(_PINNED):
+                replica = self._replica()
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica(self):
+        if _REPLICA not in self.info:
+            engines = current_app.extensions.get("hbnb_replica_engines")
+            self.info[_REPLICA] = random.choice(engines) if engines else None
+        return self.info[_REPLICA]
+
+
+def pin_to_primary(session):
+    """Send every later statement of `session` to the primary."""
+    info = session.info
+    if info.get(_PINNED):
+        return
+    info[_PINNED] = True
+    if info.get(_REPLICA) is not None:
+        # clean objects loaded from a replica may be stale: reload them from the primary
+        dirty = set(session.dirty) | set(session.new)
+        for obj in list(session.identity_map.values()):
+            if obj not in dirty:
+                session.expire(obj)
+
+
+def register_replicas(app):
+    """Route the app's reads to its replicas (no-op without REPLICA_DATABASE_URIS)."""
+    if not app.extensions.get("hbnb_replica_engines"):
+        return
+
+    from app import db
+
+    @app.before_request
+    def pin_sticky_clients():
+        # a write is modifying the primary anyway; a recent writer must see its data
+        if request.method not in ("GET", "HEAD", "OPTIONS") or request.cookies.get(STICKY_COOKIE):
+            pin_to_primary(db.session)
+
+    @app.after_request
+    def mark_writers(response):
+        if db.session.info.get(_WROTE):
+            response.set_cookie(
+                STICKY_COOKIE, "1",
+                max_age=app.config.get("REPLICA_STICKY_SECONDS", 5), httponly=True
+            )
+        return response
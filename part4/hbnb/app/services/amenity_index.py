@@ -0,0 +1,128 @@
+import re
+import threading
+import time
+
+MATCH_MODES = ("all", "any")
+
+# byte value -> offsets of its set bits, for decoding bitmaps a byte at a time
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+
+
+class AmenityBitmapIndex:
+    """
+    In-process inverted index: amenity id -> bitmap of the place ids offering it.
+    A bitmap is a Python int whose bit n is set when place n has the amenity, so
+    "has all/any of these amenities" is a handful of big-int AND/OR operations
+    (one machine word per 64 places) however many places match.
+
+    Writes through this process update it at once. Other workers' writes only show
+    up at the next rebuild, so callers rebuild it every so often (claim_refresh).
+    """
+
+    def __init__(self):
+        self._bitmaps = {}  # amenity id -> int
+        self._lock = threading.Lock()
+        self.built_at = None  # time.monotonic() of the last rebuild
+        self._journal = None  # place id -> amenity ids, set_place() calls during a refresh
+
+    def rebuild(self, rows):
+        """
+        Replace the index contents with (place_id, amenity_id) rows. set_place()
+        calls made since claim_refresh() are replayed on the new bitmaps.
+        """
+        place_ids = {}
+        for place_id, amenity_id in rows:
+            place_ids.setdefault(amenity_id, []).append(place_id)
+        # OR-ing one bit at a time would copy the whole int per row: set bytes instead
+        bitmaps = {amenity_id: bitmap_from_ids(ids) for amenity_id, ids in place_ids.items()}
+
+        with self._lock:
+            self._bitmaps = bitmaps
+            for place_id, amenity_ids in (self._journal or {}).items():
+                self._set_place(place_id, amenity_ids)
+            self._journal = None
+            self.built_at = time.monotonic()
+
+    def claim_refresh(self, ttl):
+        """
+        True when the last rebuild is over `ttl` seconds old, for one caller only:
+        the others keep using the current bitmaps while it rebuilds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.built_at is not None and self.built_at + ttl > now:
+                return False
+            self.built_at = now
+            # writes from here on may be missing from the rows about to be read
+            self._journal = {}
+            return True
+
+    def set_place(self, place_id, amenity_ids):
+        """Record that place_id offers exactly amenity_ids (replacing what it had)."""
+        amenity_ids = set(amenity_ids)
+        with self._lock:
+            self._set_place(place_id, amenity_ids)
+            if self._journal is not None:
+                self._journal[place_id] = amenity_ids
+
+    def _set_place(self, place_id, amenity_ids):
+        bit = 1 << place_id
+        for amenity_id in amenity_ids | self._bitmaps.keys():
+            bitmap = self._bitmaps.get(amenity_id, 0)
+            updated = bitmap | bit if amenity_id in amenity_ids else bitmap & ~bit
+            if updated != bitmap:
+                self._bitmaps[amenity_id] = updated
+
+    def remove_place(self, place_id):
+        self.set_place(place_id, ())
+
+    def match(self, amenity_ids, mode="all"):
+        """Bitmap of the places offering all (or any) of amenity_ids."""
+        if mode not in MATCH_MODES:
+            raise ValueError(f"amenity match mode must be one of: {', '.join(MATCH_MODES)}")
+        with self._lock:
+            bitmaps = [self._bitmaps.get(amenity_id, 0) for amenity_id in set(amenity_ids)]
+        if not bitmaps:
+            return 0
+
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = result & bitmap if mode == "all" else result | bitmap
+        return result
+
+
+def bitmap_from_ids(ids):
+    """Bitmap with the bits of ids set (ids are non-negative)."""
+    if not ids:
+        return 0
+    data = bytearray(max(ids) // 8 + 1)
+    for place_id in ids:
+        data[place_id >> 3] |= 1 << (place_id & 7)
+    return int.from_bytes(data, "little")
+
+
+def bitmap_ids(bitmap):
+    """Every id set in bitmap, ascending."""
+    # one conversion to bytes, then only the non-zero bytes are decoded: peeling
+    # off bits one at a time would copy the whole int per id
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    ids = []
+    for match in _NONZERO_BYTE.finditer(data):
+        base = match.start() * 8
+        ids.extend(base + bit for bit in _BYTE_BITS[data[match.start()]])
+    return ids
+
+
+def bitmap_page(bitmap, limit, cursor=None):
+    """Return (ids, next_cursor) for the `limit` smallest ids above cursor, like a keyset page."""
+    if cursor is not None and cursor >= 0:
+        bitmap = bitmap >> (cursor + 1) << (cursor + 1)
+    ids = []
+    # one extra id tells whether another page exists
+    while bitmap and len(ids) <= limit:
+        lowest = bitmap & -bitmap
+        ids.append(lowest.bit_length() - 1)
+        bitmap ^= lowest
+    page = ids[:limit]
+    return page, page[-1] if len(ids) > limit else None
@@ -1,18 +1,41 @@
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
 from app.models.place import Place
 from app.models.review import Review
 from app.models.user import User
 from app.models.amenity import Amenity
-from app.persistence.repository import SQLAlchemyRepository
+from app.models import serializers
+from app.persistence.repository import SQLAlchemyRepository, after_commit, unit_of_work
+from app.persistence.cache import CachedRepository, get_cache, get_snapshot
+from app.persistence.fulltext import match_query
 from app.services.repositories.user_repository import UserRepository
+from app.services.repositories.place_repository import PlaceRepository
+from app.services.repositories.review_repository import ReviewRepository
+from app.services.geo_index import GeoGridIndex
+from app.services.amenity_index import AmenityBitmapIndex, bitmap_ids, bitmap_page
 
 
 class HBnBFacade:
+    # updating any of these user fields bumps User.token_version
+    TOKEN_REVOKING_FIELDS = {"email", "password", "is_admin"}
+
     def __init__(self):
-        # Use SQLAlchemy repositories (DB-backed)
-        self.user_repo = UserRepository()
-        self.place_repo = SQLAlchemyRepository(Place)
-        self.review_repo = SQLAlchemyRepository(Review)
-        self.amenity_repo = SQLAlchemyRepository(Amenity)
+        # Use SQLAlchemy repositories (DB-backed); users, places and amenities are
+        # wrapped in a read-through cache of their serialized payloads
+        self.user_repo = CachedRepository(UserRepository(), "user")
+        self.place_repo = CachedRepository(PlaceRepository(), "place", views=("detail",))
+        self.review_repo = ReviewRepository()
+        self.amenity_repo = CachedRepository(SQLAlchemyRepository(Amenity), "amenity")
+
+    def transaction(self):
+        """
+        Unit of work: facade writes inside `with facade.transaction():` are flushed
+        and committed once at the end, or all rolled back if the block raises.
+        Cache and index updates run only after the commit.
+        """
+        return unit_of_work()
 
     # -------------------------
     # Users
@@ -35,17 +58,41 @@ class HBnBFacade:
         )
         user.hash_password(raw_password)
         self.user_repo.add(user)
+        after_commit(lambda: self._remember_token_version(user.id, user.token_version))
         return user
 
     def get_user(self, user_id):
         return self.user_repo.get(user_id)
 
+    def rehash_password_if_needed(self, user, raw_password):
+        """
+        After a successful login, upgrade the stored hash to the configured bcrypt
+        cost (the plain password is only available at this point).
+        """
+        if user.password_needs_rehash():
+            user.hash_password(raw_password)
+            self.user_repo.update(user.id, {"password": user.password})
+
+    def get_user_payload(self, user_id):
+        """
+        Cached public view of a user (id, first_name, last_name) and its updated_at,
+        as (payload, updated_at); (None, None) if not found.
+        """
+        return self._unpack(self.user_repo.get_payload(
+            user_id, lambda u: self._versioned(serializers.USER_PUBLIC(u), u.updated_at)
+        ))
+
     def get_user_by_email(self, email):
         email = (email or "").strip().lower()
         return self.user_repo.get_user_by_email(email)
 
-    def get_all_users(self):
-        return self.user_repo.get_all()
+    def get_all_users(self, columns=None):
+        """All users, or Row tuples of just `columns` (see SQLAlchemyRepository.get_all)."""
+        return self.user_repo.get_all(columns=columns)
+
+    def stream_users(self, columns=None):
+        """Iterate every user (or Row of `columns`) a batch at a time, in id order."""
+        return self.user_repo.stream(columns=columns, batch_size=self._stream_batch_size())
 
     def update_user(self, user_id, user_data):
         """
@@ -55,6 +102,9 @@ class HBnBFacade:
         if not user_data:
             return self.user_repo.update(user_id, user_data)
 
+        # only the facade moves token_version
+        user_data.pop("token_version", None)
+
         # normalize email if included
         if "email" in user_data and user_data["email"] is not None:
             user_data["email"] = user_data["email"].strip().lower()
@@ -72,8 +122,49 @@ class HBnBFacade:
             user.hash_password(raw_password)
             user_data["password"] = user.password  # store hashed value
 
-        updated = self.user_repo.update(user_id, user_data)
-        return updated
+        with self.transaction():
+            # credential / privilege changes revoke every token issued so far
+            revoke = bool(self.TOKEN_REVOKING_FIELDS & set(user_data))
+            if revoke:
+                user_data["token_version"] = User.token_version + 1
+
+            updated = self.user_repo.update(user_id, user_data)
+            if updated and revoke:
+                after_commit(lambda: self._remember_token_version(updated.id, updated.token_version))
+            if updated and {"first_name", "last_name", "email"} & set(user_data):
+                # place details embed owner and reviewer names
+                self.place_repo.invalidate(*self.place_repo.ids_showing_user(updated.id))
+            return updated
+
+    def is_token_revoked(self, jwt_payload):
+        """
+        JWT blocklist check: a token is revoked when its "ver" claim is older than the
+        user's token_version. Served from an in-memory map, so it costs at most one
+        DB query per user every TOKEN_VERSION_TTL seconds.
+        """
+        try:
+            user_id = int(jwt_payload.get("sub"))
+        except (TypeError, ValueError):
+            return True
+        versions = self._token_versions()
+        now = time.monotonic()
+        entry = versions.get(user_id)
+        if entry is None or entry[1] <= now:
+            # first token seen for this user, or the entry is old enough that another
+            # worker may have bumped the version since: re-read it once
+            user = self.get_user(user_id)
+            self._remember_token_version(user_id, user.token_version if user else None)
+            entry = versions[user_id]
+        current = entry[0]
+        return current is None or jwt_payload.get("ver", 0) != current
+
+    def _remember_token_version(self, user_id, version):
+        ttl = current_app.config.get("TOKEN_VERSION_TTL", 60)
+        self._token_versions()[user_id] = (version, time.monotonic() + ttl)
+
+    def _token_versions(self):
+        """Per-app map of user id -> (token_version or None if gone, expires_at)."""
+        return current_app.extensions.setdefault("hbnb_token_versions", {})
 
     # -------------------------
     # Amenities
@@ -81,16 +172,68 @@ class HBnBFacade:
     def create_amenity(self, amenity_data):
         new_amenity = Amenity(name=amenity_data.get("name"))
         self.amenity_repo.add(new_amenity)
+        after_commit(self._amenity_catalog().bump)
         return new_amenity
 
+    def create_amenities_bulk(self, items):
+        """
+        Validate every item, then insert the valid ones in one transaction.
+        Return one result per item: {"index", "id"} or {"index", "error"}.
+        """
+        names = [item.get("name") for item in items if isinstance(item, dict)]
+        existing = {
+            a.name for a in self.amenity_repo.get_many_by_attribute(
+                "name", [n.strip() for n in names if isinstance(n, str)]
+            )
+        }
+        seen = set()
+
+        def to_row(item):
+            name = item.get("name")
+            name = name.strip() if isinstance(name, str) else ""
+            if not name:
+                raise ValueError("Name is required")
+            if name in existing or name in seen:
+                raise ValueError(f"Amenity '{name}' already exists")
+            seen.add(name)
+            return {"name": name}
+
+        results = self._bulk_insert(self.amenity_repo, items, to_row)
+        after_commit(self._amenity_catalog().bump)
+        return results
+
     def get_amenity(self, amenity_id):
         return self.amenity_repo.get(amenity_id)
 
-    def get_all_amenities(self):
-        return self.amenity_repo.get_all()
+    def get_amenity_payload(self, amenity_id):
+        """Cached (serialized amenity, updated_at); (None, None) if not found."""
+        return self._unpack(self.amenity_repo.get_payload(
+            amenity_id, lambda a: self._versioned(serializers.AMENITY(a), a.updated_at)
+        ))
+
+    def get_all_amenities(self, columns=None):
+        return self.amenity_repo.get_all(columns=columns)
+
+    def get_amenity_catalog(self):
+        """Return (payload, etag) of the whole amenity list, served from a snapshot."""
+        payload, etag, _ = self._amenity_catalog().get()
+        return payload, etag
 
     def update_amenity(self, amenity_id, amenity_data):
-        return self.amenity_repo.update(amenity_id, amenity_data)
+        updated = self.amenity_repo.update(amenity_id, amenity_data)
+        if updated:
+            after_commit(self._amenity_catalog().bump)
+            self.place_repo.invalidate(*self.place_repo.ids_with_amenity(updated.id))
+        return updated
+
+    def _amenity_catalog(self):
+        return get_snapshot(
+            "amenities",
+            lambda: [
+                serializers.AMENITY(row)
+                for row in self.amenity_repo.get_all(columns=serializers.AMENITY.fields)
+            ]
+        )
 
     # -------------------------
     # Places
@@ -101,39 +244,255 @@ class HBnBFacade:
         if not owner_id:
             raise ValueError("Owner id is required")
 
+        with self.transaction():
+            owner = self.get_user(owner_id)
+            if not owner:
+                raise ValueError("Owner not found")
+
+            # ✅ With Place.owner relationship, we can set owner directly
+            new_place = Place(
+                title=place_data["title"],
+                description=place_data.get("description"),
+                price=place_data["price"],
+                latitude=place_data["latitude"],
+                longitude=place_data["longitude"],
+                owner=owner  # sets user_id automatically via relationship
+            )
+
+            new_place.amenities = self._get_amenities_by_ids(place_data.get("amenities") or [])
+
+            self.place_repo.add(new_place)
+            self._index_place(new_place)
+            self._index_place_amenities(new_place.id, [a.id for a in new_place.amenities])
+            return new_place
+
+    def create_places_bulk(self, owner_id, items):
+        """
+        Create many places owned by owner_id: amenity ids of all items are resolved
+        in one query, then the valid items are inserted in one transaction.
+        Return one result per item: {"index", "id"} or {"index", "error"}.
+        """
         owner = self.get_user(owner_id)
         if not owner:
             raise ValueError("Owner not found")
 
-        # ✅ With Place.owner relationship, we can set owner directly
-        new_place = Place(
-            title=place_data["title"],
-            description=place_data.get("description"),
-            price=place_data["price"],
-            latitude=place_data["latitude"],
-            longitude=place_data["longitude"],
-            owner=owner  # sets user_id automatically via relationship
-        )
-
-        for amenity_id in place_data.get("amenities", []):
-            amenity = self.get_amenity(amenity_id)
-            if amenity:
-                new_place.amenities.append(amenity)
-
-        self.place_repo.add(new_place)
-        return new_place
+        requested = {
+            amenity_id
+            for item in items if isinstance(item, dict) and isinstance(item.get("amenities"), list)
+            for amenity_id in item["amenities"]
+            if isinstance(amenity_id, int) and not isinstance(amenity_id, bool)
+        }
+        known = {a.id for a in self.amenity_repo.get_many(list(requested))}
+
+        def to_row(item):
+            title = item.get("title")
+            if not isinstance(title, str) or not title.strip():
+                raise ValueError("Title is required")
+            if len(title) > 100:
+                raise ValueError("Title must be at most 100 characters")
+            description = item.get("description")
+            if description is not None and not isinstance(description, str):
+                raise ValueError("description must be a string")
+            if description is not None and len(description) > 1024:
+                raise ValueError("description must be at most 1024 characters")
+            amenities = item.get("amenities") or []
+            if not isinstance(amenities, list) or not all(
+                isinstance(a, int) and not isinstance(a, bool) for a in amenities
+            ):
+                raise ValueError("amenities must be a list of amenity IDs")
+            unknown = [a for a in amenities if a not in known]
+            if unknown:
+                raise ValueError(f"Unknown amenity IDs: {unknown}")
+            return {
+                "title": title,
+                "description": description,
+                "price": self._bulk_number(item, "price", 0, None),
+                "latitude": self._bulk_number(item, "latitude", -90, 90),
+                "longitude": self._bulk_number(item, "longitude", -180, 180),
+                "user_id": owner.id,
+                "amenities": list(dict.fromkeys(amenities)),
+            }
+
+        results = self._bulk_insert(self.place_repo, items, to_row)
+
+        # coordinates come back from the validated items: no reload needed
+        points = [
+            (r["id"], float(items[r["index"]]["latitude"]), float(items[r["index"]]["longitude"]))
+            for r in results if "id" in r
+        ]
+
+        links = [(r["id"], items[r["index"]].get("amenities") or []) for r in results if "id" in r]
+
+        def index_points():
+            geo_index = self._geo_index()
+            for place_id, lat, lon in points:
+                geo_index.add(place_id, lat, lon)
+            amenity_index = self._amenity_index()
+            for place_id, amenity_ids in links:
+                amenity_index.set_place(place_id, amenity_ids)
+
+        after_commit(index_points)
+        return results
 
     def get_place(self, place_id):
         return self.place_repo.get(place_id)
 
+    def get_place_detail(self, place_id):
+        """Place with owner, amenities and reviews (+ authors) eager-loaded for serialization."""
+        return self.place_repo.get_detail(place_id)
+
+    def get_place_payload(self, place_id):
+        """
+        Cached detail payload (owner, amenities, reviews) of a place, as
+        (payload, updated_at) where updated_at is the newest timestamp of anything
+        the payload embeds; (None, None) if not found.
+        """
+        def serialize(p):
+            timestamps = [p.updated_at, p.owner.updated_at if p.owner else None]
+            timestamps += [a.updated_at for a in p.amenities]
+            for r in p.reviews:
+                timestamps += [r.updated_at, r.user.updated_at]
+            return self._versioned(
+                serializers.PLACE_DETAIL(p),
+                *timestamps
+            )
+
+        return self._unpack(self.place_repo.get_payload(
+            place_id, serialize, view="detail", load=self.place_repo.get_detail
+        ))
+
     def get_all_places(self):
         return self.place_repo.get_all()
 
+    def get_places_page(self, limit=20, cursor=None, min_price=None, max_price=None,
+                        amenity_id=None, sort=None, bbox=None, amenity_ids=None,
+                        amenity_match="all"):
+        """
+        Return (places, next_cursor) for one page of the place listing.
+        `amenity_ids` keeps places offering all (amenity_match="all") or any ("any")
+        of them, resolved on the in-process amenity bitmap index.
+        """
+        place_ids = None
+        if amenity_ids:
+            bitmap = self._amenity_index().match(amenity_ids, amenity_match)
+            if sort is None and min_price is None and max_price is None \
+                    and amenity_id is None and bbox is None:
+                # nothing left for SQL to filter: page straight off the bitmap
+                page_ids, next_cursor = bitmap_page(bitmap, limit, cursor)
+                places = {p.id: p for p in self.place_repo.get_many(page_ids)}
+                return [places[pid] for pid in page_ids if pid in places], next_cursor
+            place_ids = bitmap_ids(bitmap)
+
+        return self.place_repo.get_page(
+            limit,
+            cursor=cursor,
+            min_price=min_price,
+            max_price=max_price,
+            amenity_id=amenity_id,
+            sort=sort,
+            bbox=bbox,
+            place_ids=place_ids
+        )
+
+    def stream_places(self, cursor=None, min_price=None, max_price=None, amenity_id=None,
+                      sort=None, bbox=None, amenity_ids=None, amenity_match="all"):
+        """Iterate every place of the listing (same filters and order), a batch at a time."""
+        place_ids = None
+        if amenity_ids:
+            place_ids = bitmap_ids(self._amenity_index().match(amenity_ids, amenity_match))
+        return self.place_repo.stream(
+            cursor=cursor,
+            min_price=min_price,
+            max_price=max_price,
+            amenity_id=amenity_id,
+            sort=sort,
+            bbox=bbox,
+            place_ids=place_ids,
+            batch_size=self._stream_batch_size()
+        )
+
+    def search_places(self, q, limit=20, cursor=None):
+        """Return (places, next_cursor): places whose title/description match q, best first."""
+        return self.place_repo.search(match_query(q), limit, cursor=cursor)
+
+    def get_places_nearby(self, lat, lon, radius_km, limit=20):
+        """Return [(place, distance_km)] within radius_km of (lat, lon), nearest first."""
+        hits = self._geo_index().within_radius(lat, lon, radius_km)[:limit]
+        places = {p.id: p for p in self.place_repo.get_many([pid for pid, _ in hits])}
+        return [(places[pid], distance) for pid, distance in hits if pid in places]
+
     def update_place(self, place_id, place_data):
+        """Update a place; an "amenities" list of ids replaces its amenities."""
         # prevent ownership changes
         place_data.pop("owner_id", None)
         place_data.pop("user_id", None)
-        return self.place_repo.update(place_id, place_data)
+
+        with self.transaction():
+            amenity_ids = place_data.get("amenities")
+            if amenity_ids is not None:
+                place_data["amenities"] = self._get_amenities_by_ids(amenity_ids)
+                # the link table changes alone would leave the place's ETag as it was
+                place_data["updated_at"] = datetime.utcnow()
+
+            updated = self.place_repo.update(place_id, place_data)
+            if updated and ("latitude" in place_data or "longitude" in place_data):
+                self._index_place(updated)
+            if updated and amenity_ids is not None:
+                self._index_place_amenities(updated.id, [a.id for a in updated.amenities])
+            return updated
+
+    def _get_amenities_by_ids(self, amenity_ids):
+        """
+        Load amenity_ids (duplicates ignored) with one IN (...) query, in request order.
+        Raise a ValueError listing every unknown id.
+        """
+        if not isinstance(amenity_ids, list) or not all(
+            isinstance(a, int) and not isinstance(a, bool) for a in amenity_ids
+        ):
+            raise ValueError("amenities must be a list of amenity IDs")
+        wanted = list(dict.fromkeys(amenity_ids))
+        found = {a.id: a for a in self.amenity_repo.get_many(wanted)}
+        unknown = [amenity_id for amenity_id in wanted if amenity_id not in found]
+        if unknown:
+            raise ValueError(f"Unknown amenity IDs: {unknown}")
+        return [found[amenity_id] for amenity_id in wanted]
+
+    def _index_place(self, place):
+        # values read now: after the commit the instance is expired
+        point = (place.id, place.latitude, place.longitude)
+        after_commit(lambda: self._geo_index().add(*point))
+
+    def _index_place_amenities(self, place_id, amenity_ids):
+        amenity_ids = list(amenity_ids)
+        after_commit(lambda: self._amenity_index().set_place(place_id, amenity_ids))
+
+    def _amenity_index(self):
+        """
+        Per-app amenity -> places bitmap index, built from place_amenity on first use
+        and rebuilt every SNAPSHOT_TTL seconds to pick up other workers' writes.
+        """
+        index = current_app.extensions.get("hbnb_amenity_index")
+        if index is None:
+            index = AmenityBitmapIndex()
+            index.rebuild(self.place_repo.get_amenity_links())
+            current_app.extensions["hbnb_amenity_index"] = index
+        elif index.claim_refresh(current_app.config.get("SNAPSHOT_TTL", 60)):
+            index.rebuild(self.place_repo.get_amenity_links())
+        return index
+
+    def _geo_index(self):
+        """
+        Per-app grid index over place coordinates, built from the DB on first use
+        and rebuilt every SNAPSHOT_TTL seconds to pick up other workers' writes.
+        """
+        index = current_app.extensions.get("hbnb_geo_index")
+        if index is None:
+            index = GeoGridIndex(current_app.config.get("GEO_INDEX_CELL_DEG", 0.1))
+            index.rebuild(self.place_repo.get_coordinates())
+            current_app.extensions["hbnb_geo_index"] = index
+        elif index.claim_refresh(current_app.config.get("SNAPSHOT_TTL", 60)):
+            index.rebuild(self.place_repo.get_coordinates())
+        return index
 
     # -------------------------
     # Reviews
@@ -144,14 +503,70 @@ class HBnBFacade:
         if not user or not place:
             return None
 
-        new_review = Review(
-            text=review_data["text"],
-            rating=review_data["rating"],
-            user=user,
-            place=place
-        )
-        self.review_repo.add(new_review)
-        return new_review
+        with self.transaction():
+            rating = self._parse_rating(review_data["rating"])
+            new_review = Review(
+                text=review_data["text"],
+                rating=rating,
+                user=user,
+                place=place
+            )
+            # committed together with the review by review_repo.add
+            self._adjust_place_rating(place, count_delta=1, rating_delta=rating)
+            try:
+                self.review_repo.add(new_review)
+            except IntegrityError:
+                # a concurrent request won the race past has_reviewed()
+                raise ValueError("You have already reviewed this place")
+            self.place_repo.invalidate(place.id)
+            return new_review
+
+    def create_reviews_bulk(self, user_id, items):
+        """
+        Create many reviews by user_id with the same rules as the single endpoint.
+        Places and previous reviews are looked up in one query each; the reviews
+        and the places' rating aggregates are written in one transaction.
+        Return one result per item: {"index", "id"} or {"index", "error"}.
+        """
+        user = self.get_user(user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        place_ids = {
+            item.get("place_id") for item in items
+            if isinstance(item, dict) and isinstance(item.get("place_id"), int)
+        }
+        places = {p.id: p for p in self.place_repo.get_many(list(place_ids))}
+        reviewed = self.review_repo.reviewed_place_ids(user.id, list(places))
+
+        def to_row(item):
+            text = item.get("text")
+            if not isinstance(text, str) or not text.strip():
+                raise ValueError("Text is required")
+            place = places.get(item.get("place_id"))
+            if not place:
+                raise ValueError("Place not found")
+            if place.user_id == user.id:
+                raise ValueError("You cannot review your own place")
+            if place.id in reviewed:
+                raise ValueError("You have already reviewed this place")
+            reviewed.add(place.id)
+            return {
+                "text": text,
+                "rating": self._parse_rating(item.get("rating")),
+                "user_id": user.id,
+                "place_id": place.id,
+            }
+
+        try:
+            results = self._bulk_insert(self.review_repo, items, to_row)
+        except IntegrityError:
+            # a concurrent request reviewed one of these places first
+            raise ValueError("You have already reviewed one of these places")
+        self.place_repo.invalidate(*{
+            items[r["index"]]["place_id"] for r in results if "id" in r
+        })
+        return results
 
     def get_review(self, review_id):
         return self.review_repo.get(review_id)
@@ -159,8 +574,139 @@ class HBnBFacade:
     def get_all_reviews(self):
         return self.review_repo.get_all()
 
+    def get_reviews_page(self, limit=20, cursor=None, place_id=None, user_id=None, columns=None):
+        """
+        Return (reviews, next_cursor), optionally restricted to one place and/or author.
+        With `columns`, reviews are Row tuples of just those columns.
+        """
+        filters = {}
+        if place_id is not None:
+            filters["place_id"] = place_id
+        if user_id is not None:
+            filters["user_id"] = user_id
+        return self.review_repo.get_page(limit, cursor=cursor, columns=columns, **filters)
+
+    def stream_reviews(self, cursor=None, place_id=None, user_id=None, columns=None):
+        """Iterate every review get_reviews_page would list, a batch at a time."""
+        filters = {}
+        if place_id is not None:
+            filters["place_id"] = place_id
+        if user_id is not None:
+            filters["user_id"] = user_id
+        return self.review_repo.stream(
+            cursor=cursor, columns=columns, batch_size=self._stream_batch_size(), **filters
+        )
+
+    def has_reviewed(self, user_id, place_id):
+        return self.review_repo.exists_for(user_id, place_id)
+
     def update_review(self, review_id, review_data):
-        return self.review_repo.update(review_id, review_data)
+        review = self.get_review(review_id)
+        if not review:
+            return None
+
+        with self.transaction():
+            old_place, old_rating = review.place, review.rating
+            new_rating = old_rating
+            if "rating" in review_data:
+                new_rating = review_data["rating"] = self._parse_rating(review_data["rating"])
+
+            new_place = old_place
+            if "place_id" in review_data and review_data["place_id"] != old_place.id:
+                new_place = self.get_place(review_data["place_id"])
+                if not new_place:
+                    raise ValueError("Place not found")
+
+            if new_place is old_place:
+                self._adjust_place_rating(old_place, rating_delta=new_rating - old_rating)
+            else:
+                self._adjust_place_rating(old_place, count_delta=-1, rating_delta=-old_rating)
+                self._adjust_place_rating(new_place, count_delta=1, rating_delta=new_rating)
+
+            try:
+                updated = self.review_repo.update(review_id, review_data)
+            except IntegrityError:
+                raise ValueError("You have already reviewed this place")
+            self.place_repo.invalidate(old_place.id, new_place.id)
+            return updated
 
     def delete_review(self, review_id):
-        return self.review_repo.delete(review_id)
\ No newline at end of file
+        review = self.get_review(review_id)
+        if not review:
+            return False
+        with self.transaction():
+            place_id = review.place_id
+            self._adjust_place_rating(review.place, count_delta=-1, rating_delta=-review.rating)
+            deleted = self.review_repo.delete(review_id)
+            self.place_repo.invalidate(place_id)
+            return deleted
+
+    @staticmethod
+    def _bulk_insert(repo, items, to_row):
+        """
+        Run to_row over every item (ValueError -> per-item error), insert the valid
+        rows with one repo.add_mappings call and return the per-item results.
+        """
+        rows, results = [], []
+        for index, item in enumerate(items):
+            result = {"index": index}
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Item must be an object")
+                rows.append(to_row(item))
+                result["id"] = None  # filled in after the insert
+            except ValueError as e:
+                result["error"] = str(e)
+            results.append(result)
+
+        ids = iter(repo.add_mappings(rows))
+        for result in results:
+            if "id" in result:
+                result["id"] = next(ids)
+        return results
+
+    @staticmethod
+    def _bulk_number(item, key, minimum, maximum):
+        value = item.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{key} must be a number")
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            raise ValueError(f"{key} is out of range")
+        return float(value)
+
+    @staticmethod
+    def _versioned(payload, *timestamps):
+        """Cache entry: the payload plus the newest of the given updated_at values."""
+        newest = max((ts for ts in timestamps if ts is not None), default=None)
+        return {"data": payload, "updated_at": newest.isoformat() if newest else None}
+
+    @staticmethod
+    def _unpack(entry):
+        if entry is None:
+            return None, None
+        updated_at = entry["updated_at"]
+        return entry["data"], datetime.fromisoformat(updated_at) if updated_at else None
+
+    @staticmethod
+    def _parse_rating(rating):
+        try:
+            return int(rating)
+        except (TypeError, ValueError):
+            raise ValueError("Rating must be an integer")
+
+    @staticmethod
+    def _stream_batch_size():
+        return current_app.config.get("STREAM_BATCH_SIZE", 1000)
+
+    def _adjust_place_rating(self, place, count_delta=0, rating_delta=0):
+        """Stage an in-SQL increment of the place's review aggregates (no commit)."""
+        if count_delta:
+            place.review_count = Place.review_count + count_delta
+        if rating_delta:
+            place.rating_sum = Place.rating_sum + rating_delta
+
+    # -------------------------
+    # Monitoring
+    # -------------------------
+    def cache_stats(self):
+        return get_cache().stats()
@@ -0,0 +1,178 @@
+import math
+import threading
+import time
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two (lat, lon) points, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    Return (min_lat, min_lon, max_lat, max_lon) enclosing the circle.
+    min_lon > max_lon means the box wraps across the antimeridian.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+
+    # the circle contains a pole: every longitude is in range
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+
+    d_lon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(lat))))
+    if d_lon >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+
+    min_lon, max_lon = lon - d_lon, lon + d_lon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, min_lon, max_lat, max_lon
+
+
+class GeoGridIndex:
+    """
+    In-process grid index: place id -> (lat, lon), bucketed into fixed-size
+    lat/lon cells so a radius query only looks at the cells its bounding box touches.
+
+    Writes through this process update it at once. Other workers' writes only show
+    up at the next rebuild, so callers rebuild it every so often (claim_refresh).
+    """
+
+    def __init__(self, cell_size_deg=0.1):
+        self.cell_size = cell_size_deg
+        self._cells = {}      # (row, col) -> set of place ids
+        self._points = {}     # place id -> (lat, lon)
+        self._lock = threading.Lock()
+        self.built_at = None  # time.monotonic() of the last rebuild
+        self._journal = None  # place id -> point or None (removed) during a refresh
+
+    def _cell(self, lat, lon):
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def rebuild(self, rows):
+        """
+        Replace the index contents with (id, lat, lon) rows. The new grid is built
+        outside the lock and swapped in, so queries keep using the current one
+        meanwhile; add()/remove() calls made since claim_refresh() are replayed on it.
+        """
+        cells, points = {}, {}
+        for place_id, lat, lon in rows:
+            points[place_id] = (lat, lon)
+            cells.setdefault(self._cell(lat, lon), set()).add(place_id)
+
+        with self._lock:
+            # the old grid is freed after the lock is released, not while holding it
+            cells, points, self._cells, self._points = self._cells, self._points, cells, points
+            for place_id, point in (self._journal or {}).items():
+                self._remove(place_id)
+                if point is not None:
+                    self._insert(place_id, *point)
+            self._journal = None
+            self.built_at = time.monotonic()
+
+    def claim_refresh(self, ttl):
+        """
+        True when the last rebuild is over `ttl` seconds old, for one caller only:
+        the others keep using the current grid while it rebuilds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.built_at is not None and self.built_at + ttl > now:
+                return False
+            self.built_at = now
+            # writes from here on may be missing from the rows about to be read
+            self._journal = {}
+            return True
+
+    def add(self, place_id, lat, lon):
+        """Insert a place, or move it if it is already indexed."""
+        with self._lock:
+            self._remove(place_id)
+            self._insert(place_id, lat, lon)
+            if self._journal is not None:
+                self._journal[place_id] = (lat, lon)
+
+    def remove(self, place_id):
+        with self._lock:
+            self._remove(place_id)
+            if self._journal is not None:
+                self._journal[place_id] = None
+
+    def _insert(self, place_id, lat, lon):
+        self._points[place_id] = (lat, lon)
+        self._cells.setdefault(self._cell(lat, lon), set()).add(place_id)
+
+    def _remove(self, place_id):
+        point = self._points.pop(place_id, None)
+        if point is None:
+            return
+        cell = self._cell(*point)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(place_id)
+            if not bucket:
+                del self._cells[cell]
+
+    def within_radius(self, lat, lon, radius_km):
+        """Return [(place_id, distance_km)] inside the circle, nearest first."""
+        min_lat, min_lon, max_lat, max_lon = bounding_box(lat, lon, radius_km)
+
+        with self._lock:
+            candidates = self._candidates(min_lat, min_lon, max_lat, max_lon)
+            points = [(pid, self._points[pid]) for pid in candidates]
+
+        hits = []
+        for place_id, (p_lat, p_lon) in points:
+            distance = haversine_km(lat, lon, p_lat, p_lon)
+            if distance <= radius_km:
+                hits.append((place_id, distance))
+        hits.sort(key=lambda hit: (hit[1], hit[0]))
+        return hits
+
+    def _candidates(self, min_lat, min_lon, max_lat, max_lon):
+        row_lo, col_lo = self._cell(min_lat, min_lon)
+        row_hi, col_hi = self._cell(max_lat, max_lon)
+        wraps = min_lon > max_lon
+
+        if wraps:
+            cols_in_box = (self._cell(0, 180)[1] - col_lo + 1) + (col_hi - self._cell(0, -180)[1] + 1)
+        else:
+            cols_in_box = col_hi - col_lo + 1
+
+        # wide boxes: walking the populated cells is cheaper than probing empty ones
+        if (row_hi - row_lo + 1) * cols_in_box > len(self._cells):
+            def col_ok(col):
+                if wraps:
+                    return col >= col_lo or col <= col_hi
+                return col_lo <= col <= col_hi
+
+            return [
+                pid
+                for (row, col), bucket in self._cells.items()
+                if row_lo <= row <= row_hi and col_ok(col)
+                for pid in bucket
+            ]
+
+        if wraps:
+            col_ranges = [
+                range(col_lo, self._cell(0, 180)[1] + 1),
+                range(self._cell(0, -180)[1], col_hi + 1),
+            ]
+        else:
+            col_ranges = [range(col_lo, col_hi + 1)]
+
+        found = []
+        for row in range(row_lo, row_hi + 1):
+            for cols in col_ranges:
+                for col in cols:
+                    found.extend(self._cells.get((row, col), ()))
+        return found
@@ -0,0 +1,169 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class MemoryRateLimiter:
+    """
+    In-process token buckets. Each key holds up to `capacity` tokens and refills
+    continuously at capacity / per_seconds tokens per second. At most `max_keys`
+    buckets are kept: past that, the least recently hit one is forgotten, so
+    rotating emails or IPs cannot grow memory without bound.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        # key -> (tokens, last_refill, capacity, per_seconds), least recently hit first
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _level(self, key, capacity, per_seconds, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return float(capacity)
+        tokens, last, _, _ = bucket
+        return min(capacity, tokens + (now - last) * capacity / per_seconds)
+
+    def hit(self, key, capacity, per_seconds):
+        """Take one token. Return (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._level(key, capacity, per_seconds, now)
+            if tokens < 1:
+                return False, math.ceil((1 - tokens) * per_seconds / capacity)
+            if key in self._buckets:
+                self._buckets.move_to_end(key)
+            elif len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+            self._buckets[key] = (tokens - 1, now, capacity, per_seconds)
+            return True, 0
+
+    def peek(self, key, capacity, per_seconds):
+        """Like hit() but without taking a token."""
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._level(key, capacity, per_seconds, now)
+        if tokens < 1:
+            return False, math.ceil((1 - tokens) * per_seconds / capacity)
+        return True, 0
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class RedisRateLimiter:
+    """
+    Fixed-window counters in a Redis-protocol store, shared by every worker.
+    Coarser than token buckets but needs only INCR/EXPIRE. Requires `redis`.
+    """
+
+    def __init__(self, url, prefix="hbnb:rl:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("LOGIN_RATE_LIMIT_STORAGE='redis' requires the 'redis' package")
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _window_key(self, key, per_seconds):
+        window = int(time.time() // per_seconds)
+        retry_after = int(per_seconds - time.time() % per_seconds) + 1
+        return f"{self.prefix}{key}:{window}", retry_after
+
+    def hit(self, key, capacity, per_seconds):
+        window_key, retry_after = self._window_key(key, per_seconds)
+        pipe = self._client.pipeline()
+        pipe.incr(window_key)
+        pipe.expire(window_key, int(per_seconds) + 1)
+        count = pipe.execute()[0]
+        if count > capacity:
+            return False, retry_after
+        return True, 0
+
+    def peek(self, key, capacity, per_seconds):
+        window_key, retry_after = self._window_key(key, per_seconds)
+        count = int(self._client.get(window_key) or 0)
+        if count >= capacity:
+            return False, retry_after
+        return True, 0
+
+    def reset(self, key):
+        keys = list(self._client.scan_iter(match=f"{self.prefix}{key}:*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+class LoginThrottle:
+    """
+    Login policy checked before the user lookup and bcrypt:
+    - every attempt takes a token from its IP's bucket and its email's bucket;
+    - every failed password takes a token from the email's failure bucket, and
+      once that is empty the email is refused until it refills (reset on success).
+    Limits are (attempts, per_seconds) pairs.
+    """
+
+    def __init__(self, store, ip_limit, email_limit, failure_limit):
+        self.store = store
+        self.ip_limit = ip_limit
+        self.email_limit = email_limit
+        self.failure_limit = failure_limit
+        self._lock = threading.Lock()
+        self.counters = {"rejected": 0, "verified": 0, "succeeded": 0, "failed": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def check(self, ip, email):
+        """Return (allowed, retry_after_seconds) for a new attempt."""
+        for allowed, retry_after in (
+            self.store.peek(f"fail:{email}", *self.failure_limit),
+            self.store.hit(f"ip:{ip}", *self.ip_limit),
+            self.store.hit(f"email:{email}", *self.email_limit),
+        ):
+            if not allowed:
+                self._count("rejected")
+                return False, retry_after
+        return True, 0
+
+    def record(self, email, success, verified=True):
+        """Record the outcome of an attempt that got past check()."""
+        if verified:
+            self._count("verified")
+        if success:
+            self._count("succeeded")
+            self.store.reset(f"fail:{email}")
+        else:
+            self._count("failed")
+            self.store.hit(f"fail:{email}", *self.failure_limit)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+
+def get_login_throttle():
+    """Return the current app's LoginThrottle, creating it from config on first use."""
+    throttle = current_app.extensions.get("hbnb_login_throttle")
+    if throttle is None:
+        config = current_app.config
+        storage = config.get("LOGIN_RATE_LIMIT_STORAGE", "memory")
+        if storage == "memory":
+            store = MemoryRateLimiter()
+        elif storage == "redis":
+            store = RedisRateLimiter(config["LOGIN_RATE_LIMIT_URL"])
+        else:
+            raise ValueError(f"Unknown LOGIN_RATE_LIMIT_STORAGE '{storage}'")
+
+        throttle = LoginThrottle(
+            store,
+            ip_limit=config.get("LOGIN_IP_LIMIT", (20, 60)),
+            email_limit=config.get("LOGIN_EMAIL_LIMIT", (10, 60)),
+            failure_limit=config.get("LOGIN_FAILURE_LIMIT", (5, 300)),
+        )
+        current_app.extensions["hbnb_login_throttle"] = throttle
+    return throttle
@@ -0,0 +1,148 @@
+import json
+from sqlalchemy.orm import joinedload, selectinload
+from app import db
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.persistence.fulltext import FTS_TABLE
+from app.persistence.repository import SQLAlchemyRepository
+
+class PlaceRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Place)
+
+    def get_detail(self, place_id):
+        """
+        Load a place with owner, amenities, reviews and review authors in a fixed
+        number of queries (3), however many reviews the place has.
+        """
+        return (
+            self.model.query
+            .options(
+                joinedload(Place.owner),
+                selectinload(Place.amenities),
+                selectinload(Place.reviews).joinedload(Review.user),
+            )
+            .filter(Place.id == place_id)
+            .first()
+        )
+
+    # listing sort orders (highest first) -> indexed column/expression
+    SORT_KEYS = {
+        "rating": Place.average_rating,
+        "review_count": Place.review_count,
+    }
+
+    # BM25 over the FTS5 index (lower is better; title hits weigh 10x description hits),
+    # keyset-paginated on (score, id) like the sorted listing
+    SEARCH_SQL = db.text(f"""
+        WITH hits AS (
+            SELECT rowid AS id, bm25({FTS_TABLE}, 10.0, 1.0) AS score
+            FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match
+        )
+        SELECT id FROM hits
+        WHERE :cursor IS NULL
+           OR score > (SELECT score FROM hits WHERE id = :cursor)
+           OR (score = (SELECT score FROM hits WHERE id = :cursor) AND id > :cursor)
+        ORDER BY score, id
+        LIMIT :limit
+    """)
+
+    def search(self, match, limit, cursor=None):
+        """
+        Return (places, next_cursor) for one page of full-text hits, best first.
+        `match` is an FTS5 query (see fulltext.match_query).
+        """
+        # fetch one extra id to know whether another page exists
+        ids = db.session.execute(
+            self.SEARCH_SQL, {"match": match, "cursor": cursor, "limit": limit + 1}
+        ).scalars().all()
+        page_ids = ids[:limit]
+        places = {place.id: place for place in self.get_many(page_ids)}
+        next_cursor = page_ids[-1] if len(ids) > limit else None
+        return [places[place_id] for place_id in page_ids if place_id in places], next_cursor
+
+    def ids_showing_user(self, user_id):
+        """Ids of places whose detail payload embeds this user (as owner or reviewer)."""
+        owned = db.session.query(Place.id).filter(Place.user_id == user_id)
+        reviewed = db.session.query(Review.place_id).filter(Review.user_id == user_id)
+        return [row[0] for row in owned.union(reviewed).all()]
+
+    def ids_with_amenity(self, amenity_id):
+        return [row[0] for row in db.session.execute(self._place_ids_with_amenity(amenity_id))]
+
+    @staticmethod
+    def _place_ids_with_amenity(amenity_id):
+        # straight off the association table, served by ix_place_amenity_amenity_id
+        return db.select(place_amenity.c.place_id).where(place_amenity.c.amenity_id == amenity_id)
+
+    def get_amenity_links(self):
+        """(place_id, amenity_id) for every place/amenity link."""
+        return db.session.execute(
+            db.select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+        ).all()
+
+    def get_coordinates(self):
+        """(id, latitude, longitude) for every place, without loading ORM objects."""
+        return db.session.query(Place.id, Place.latitude, Place.longitude).all()
+
+    def _insert_mappings(self, rows):
+        """Rows may carry an "amenities" list of ids; links go in the same transaction."""
+        amenity_ids = [row.pop("amenities", None) or () for row in rows]
+        ids = super()._insert_mappings(rows)
+        links = [
+            {"place_id": place_id, "amenity_id": amenity_id}
+            for place_id, amenities in zip(ids, amenity_ids)
+            for amenity_id in amenities
+        ]
+        if links:
+            db.session.execute(place_amenity.insert(), links)
+        return ids
+
+    def get_page(self, limit, cursor=None, min_price=None, max_price=None, amenity_id=None,
+                 sort=None, bbox=None, place_ids=None):
+        """
+        Keyset pagination: return up to `limit` places after `cursor`, filtered in SQL,
+        plus the cursor of the next page (None on the last page). `sort` is one of
+        SORT_KEYS; by default places are listed by id. `bbox` is
+        (min_lat, min_lon, max_lat, max_lon); min_lon > max_lon wraps the antimeridian.
+        `place_ids` restricts the listing to those ids (e.g. an amenity index match).
+        """
+        query = self._listing_query(min_price, max_price, amenity_id, bbox, place_ids)
+        return self._keyset_page(query, limit, cursor, sort_key=self._sort_key(sort))
+
+    def stream(self, cursor=None, min_price=None, max_price=None, amenity_id=None,
+               sort=None, bbox=None, place_ids=None, batch_size=1000):
+        """Every place get_page would list from `cursor` on, batch_size rows at a time."""
+        query = self._listing_query(min_price, max_price, amenity_id, bbox, place_ids)
+        return self._keyset_stream(query, cursor, sort_key=self._sort_key(sort),
+                                   batch_size=batch_size)
+
+    def _sort_key(self, sort):
+        if sort is not None and sort not in self.SORT_KEYS:
+            raise ValueError(f"Invalid sort key '{sort}'")
+        return self.SORT_KEYS.get(sort)
+
+    def _listing_query(self, min_price, max_price, amenity_id, bbox, place_ids=None):
+        query = self.model.query
+
+        if place_ids is not None:
+            # one JSON parameter instead of one bind variable per id (SQLite caps those)
+            ids = db.select(db.literal_column("value")).select_from(
+                db.func.json_each(json.dumps(list(place_ids)))
+            )
+            query = query.filter(Place.id.in_(ids))
+
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+        if amenity_id is not None:
+            query = query.filter(Place.id.in_(self._place_ids_with_amenity(amenity_id)))
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            query = query.filter(Place.latitude.between(min_lat, max_lat))
+            if min_lon <= max_lon:
+                query = query.filter(Place.longitude.between(min_lon, max_lon))
+            else:
+                query = query.filter(db.or_(Place.longitude >= min_lon, Place.longitude <= max_lon))
+        return query
@@ -0,0 +1,52 @@
+from collections import defaultdict
+from datetime import datetime
+from app import db
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.repository import SQLAlchemyRepository
+
+class ReviewRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Review)
+
+    def exists_for(self, user_id, place_id):
+        """EXISTS lookup served by the (user_id, place_id) unique index."""
+        query = self.model.query.filter_by(user_id=user_id, place_id=place_id)
+        return db.session.query(query.exists()).scalar()
+
+    def reviewed_place_ids(self, user_id, place_ids):
+        """Subset of place_ids the user has already reviewed, in one query."""
+        if not place_ids:
+            return set()
+        rows = (
+            db.session.query(Review.place_id)
+            .filter(Review.user_id == user_id, Review.place_id.in_(place_ids))
+            .all()
+        )
+        return {row[0] for row in rows}
+
+    def _insert_mappings(self, rows):
+        """Also bump the review aggregates of every affected place, in the same transaction."""
+        ids = super()._insert_mappings(rows)
+
+        totals = defaultdict(lambda: [0, 0])
+        for row in rows:
+            totals[row["place_id"]][0] += 1
+            totals[row["place_id"]][1] += row["rating"]
+
+        places = Place.__table__
+        statement = (
+            places.update()
+            .where(places.c.id == db.bindparam("pid"))
+            .values(
+                review_count=places.c.review_count + db.bindparam("count_delta"),
+                rating_sum=places.c.rating_sum + db.bindparam("rating_delta"),
+                updated_at=db.bindparam("now"),
+            )
+        )
+        now = datetime.utcnow()
+        db.session.execute(statement, [
+            {"pid": place_id, "count_delta": count, "rating_delta": rating, "now": now}
+            for place_id, (count, rating) in totals.items()
+        ])
+        return ids
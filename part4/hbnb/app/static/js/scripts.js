@@ -90,11 +90,19 @@ async function loginUser(email, password) {
   return token;
 }
 
-async function fetchPlaces(token) {
+// Fetches ONE page of places; filters are applied server-side.
+// params: { limit, cursor, min_price, max_price, amenity }
+async function fetchPlaces(token, params = {}) {
   const headers = {};
   if (token) headers["Authorization"] = `Bearer ${decodeURIComponent(token)}`;
 
-  const response = await fetch("/api/v1/places/", { headers });
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== "") query.set(key, value);
+  });
+  const qs = query.toString();
+
+  const response = await fetch(`/api/v1/places/${qs ? `?${qs}` : ""}`, { headers });
 
   let data = {};
   try { data = await response.json(); } catch (_) {}
@@ -104,7 +112,8 @@ async function fetchPlaces(token) {
     throw new Error(msg);
   }
 
-  return Array.isArray(data) ? data : (data.places || []);
+  if (Array.isArray(data)) return { places: data, nextCursor: null };
+  return { places: data.places || [], nextCursor: data.next_cursor ?? null };
 }
 
 async function fetchPlaceById(token, placeId) {
@@ -141,7 +150,9 @@ async function fetchReviewsForPlace(token, placeId) {
 }
 
 // ---------- INDEX PAGE (TASK REQUIREMENT) ----------
-let __placesCache = []; // store for filtering
+const PLACES_PAGE_SIZE = 20;
+let __placesCache = []; // places rendered so far
+let __placesCursor = null; // next_cursor of the last page fetched
 
 function ensurePriceFilterOptions(priceFilter) {
   // Requirement: options must be 10, 50, 100, All
@@ -174,13 +185,13 @@ function normalizePlace(p) {
   };
 }
 
-function displayPlaces(places) {
+function displayPlaces(places, append = false) {
   const placesList = document.getElementById("places-list");
   if (!placesList) return;
 
-  placesList.innerHTML = "";
+  if (!append) placesList.innerHTML = "";
 
-  if (!places || places.length === 0) {
+  if (!append && (!places || places.length === 0)) {
     placesList.innerHTML = `<p class="muted">No places found.</p>`;
     return;
   }
@@ -203,20 +214,40 @@ function displayPlaces(places) {
   });
 }
 
-function applyPriceFilter(selectedValue) {
-  const cards = document.querySelectorAll("#places-list .place-card");
+function priceFilterParams(selectedValue) {
+  const params = { limit: PLACES_PAGE_SIZE };
+  if (selectedValue && selectedValue !== "all") params.max_price = Number(selectedValue);
+  return params;
+}
 
-  cards.forEach((card) => {
-    if (selectedValue === "all") {
-      card.style.display = "";
-      return;
-    }
+function updateLoadMoreButton() {
+  const loadMore = document.getElementById("load-more");
+  if (loadMore) loadMore.hidden = __placesCursor === null;
+}
 
-    const maxPrice = Number(selectedValue);
-    const price = Number(card.dataset.price || "0");
+// Price filtering happens in SQL: re-fetch the first page for the new filter
+async function applyPriceFilter(token, selectedValue) {
+  try {
+    const page = await fetchPlaces(token, priceFilterParams(selectedValue));
+    __placesCache = page.places;
+    __placesCursor = page.nextCursor;
+  } catch (err) {
+    const maxPrice = selectedValue === "all" ? Infinity : Number(selectedValue);
+    __placesCache = PLACES.filter((p) => p.price <= maxPrice);
+    __placesCursor = null;
+  }
+  displayPlaces(__placesCache);
+  updateLoadMoreButton();
+}
 
-    card.style.display = price <= maxPrice ? "" : "none";
-  });
+async function loadMorePlaces(token, selectedValue) {
+  if (__placesCursor === null) return;
+
+  const page = await fetchPlaces(token, { ...priceFilterParams(selectedValue), cursor: __placesCursor });
+  __placesCache = __placesCache.concat(page.places);
+  __placesCursor = page.nextCursor;
+  displayPlaces(page.places, true);
+  updateLoadMoreButton();
 }
 
 async function initIndexPage() {
@@ -227,17 +258,14 @@ async function initIndexPage() {
   const token = checkAuthentication();
   ensurePriceFilterOptions(priceFilter);
 
-  try {
-    const apiPlaces = await fetchPlaces(token);
-    __placesCache = apiPlaces;
-    displayPlaces(__placesCache);
-  } catch (err) {
-    __placesCache = PLACES;
-    displayPlaces(__placesCache);
+  priceFilter.addEventListener("change", (e) => applyPriceFilter(token, e.target.value));
+
+  const loadMore = document.getElementById("load-more");
+  if (loadMore) {
+    loadMore.addEventListener("click", () => loadMorePlaces(token, priceFilter.value).catch(() => {}));
   }
 
-  priceFilter.addEventListener("change", (e) => applyPriceFilter(e.target.value));
-  applyPriceFilter(priceFilter.value);
+  await applyPriceFilter(token, priceFilter.value);
 }
 
 // ---------- Place ID helpers ----------
@@ -419,7 +447,7 @@ async function submitReview(token, placeId, reviewText, rating) {
       Authorization: `Bearer ${jwt}`
     },
     body: JSON.stringify({
-      place_id: placeId,
+      place_id: Number(placeId),
       text: reviewText,
       rating: Number(rating)
     })
@@ -0,0 +1,91 @@
+"""
+Encode time of a 10k-place listing response: Flask-RESTX's default JSON
+representation vs. app.api.representations with each available backend.
+
+    python benchmarks/json_encoding.py [--places 10000] [--repeat 20]
+
+The payload has the shape of GET /api/v1/places/ (serializers.PLACE rows) plus
+created_at/updated_at datetimes, which the RESTX default cannot encode: for it
+they are pre-converted to strings, as handlers had to do.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_restx.representations import output_json as restx_output_json  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.api import representations  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+
+def listing(count):
+    start = datetime(2025, 1, 1)
+    return {
+        "places": [
+            {
+                "id": i,
+                "title": f"Place {i}",
+                "description": "A quiet place near the sea with a view of the old town",
+                "price": 50.0 + i % 300,
+                "latitude": 48.0 + i / 1e5,
+                "longitude": 2.0 + i / 1e5,
+                "user_id": 1 + i % 500,
+                "review_count": i % 40,
+                "average_rating": round(1 + (i % 400) / 100, 2),
+                "created_at": start + timedelta(minutes=i),
+                "updated_at": start + timedelta(minutes=2 * i),
+            }
+            for i in range(count)
+        ],
+        "next_cursor": None,
+    }
+
+
+def stringify_dates(payload):
+    return {
+        "places": [
+            dict(p, created_at=p["created_at"].isoformat(), updated_at=p["updated_at"].isoformat())
+            for p in payload["places"]
+        ],
+        "next_cursor": payload["next_cursor"],
+    }
+
+
+def measure(name, encode, payload, repeat):
+    encode(payload)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        size = len(encode(payload).get_data())
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{name:<16} {elapsed * 1000:>8.2f} ms   {size / 1024:>7.0f} KiB")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--places", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = listing(args.places)
+    app = create_app(TestingConfig)
+    with app.test_request_context():
+        baseline = measure("restx default", lambda data: restx_output_json(data, 200),
+                           stringify_dates(payload), args.repeat)
+        for name in representations.BACKENDS:
+            if name == "orjson" and representations.orjson is None:
+                print("orjson           not installed")
+                continue
+            app.config["JSON_BACKEND"] = name
+            elapsed = measure(name, lambda data: representations.output_json(data, 200), payload,
+                              args.repeat)
+            print(f"{'':<16} {baseline / elapsed:>8.1f}x vs restx default")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Peak memory and time of the user list built from full User objects vs. a
+column projection (id, first_name, last_name).
+
+    python benchmarks/list_projection.py [--users 5000]
+
+Users are bulk-inserted into an in-memory database; each variant runs in a
+fresh session so neither benefits from the other's identity map.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import facade  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+# a realistic bcrypt hash length; the value itself is never checked
+PASSWORD_HASH = "$2b$12$" + "x" * 53
+
+
+def full_objects():
+    return [
+        {"id": u.id, "first_name": u.first_name, "last_name": u.last_name}
+        for u in facade.get_all_users()
+    ]
+
+
+def projection():
+    return [row._asdict() for row in facade.get_all_users(columns=("id", "first_name", "last_name"))]
+
+
+def measure(name, build):
+    db.session.remove()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} rows {len(result):>7}   peak {peak / 1024:>9.0f} KiB   {elapsed * 1000:>7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        facade.user_repo.add_mappings([
+            {"first_name": "Guest", "last_name": str(i), "email": f"guest{i}@bench.test",
+             "password": PASSWORD_HASH, "is_admin": False}
+            for i in range(args.users)
+        ])
+        measure("orm", full_objects)
+        measure("projection", projection)
+        assert full_objects() == projection()
+        assert User.query.count() == args.users
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Read throughput of the place listing while a writer keeps inserting reviews,
+with the default SQLite settings vs. ProductionConfig (WAL + pragmas).
+
+    python benchmarks/sqlite_concurrency.py [--readers 8] [--seconds 5]
+
+Each profile runs against a fresh database file in a temporary directory.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.services import facade  # noqa: E402
+from config import Config, ProductionConfig  # noqa: E402
+
+
+def make_config(base, path):
+    return type("BenchConfig", (base,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "BCRYPT_LOG_ROUNDS": 4,
+        "CACHE_TYPE": "none",
+    })
+
+
+def seed(places=200):
+    owner = facade.create_user({
+        "first_name": "Owner", "last_name": "Bench",
+        "email": "owner@bench.test", "password": "secret"
+    })
+    facade.create_places_bulk(owner.id, [
+        {"title": f"Place {i}", "price": 50.0 + i, "latitude": 0.0, "longitude": 0.0}
+        for i in range(places)
+    ])
+    guests = [
+        facade.create_user({
+            "first_name": "Guest", "last_name": str(i),
+            "email": f"guest{i}@bench.test", "password": "secret"
+        }).id
+        for i in range(50)
+    ]
+    return [p.id for p in facade.get_all_places()], guests
+
+
+def run(name, config_class, readers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(config_class, os.path.join(tmp, "bench.db")))
+        with app.app_context():
+            db.create_all()
+            place_ids, guest_ids = seed()
+
+        stop = threading.Event()
+        reads = [0] * readers
+        writes = [0]
+        errors = [0]
+
+        def reader(slot):
+            with app.app_context():
+                while not stop.is_set():
+                    try:
+                        facade.get_places_page(limit=20, sort="rating")
+                        reads[slot] += 1
+                    except Exception:
+                        errors[0] += 1
+                    finally:
+                        db.session.remove()
+
+        def writer():
+            with app.app_context():
+                i = 0
+                while not stop.is_set():
+                    guest = guest_ids[i % len(guest_ids)]
+                    place = place_ids[(i // len(guest_ids)) % len(place_ids)]
+                    try:
+                        facade.create_review({"text": "bench", "rating": 1 + i % 5,
+                                              "user_id": guest, "place_id": place})
+                        writes[0] += 1
+                    except Exception:
+                        errors[0] += 1
+                    finally:
+                        db.session.remove()
+                    i += 1
+
+        threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+        threads.append(threading.Thread(target=writer))
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        with app.app_context():
+            db.engine.dispose()
+
+    print(f"{name:<12} reads/s {sum(reads) / seconds:>9.0f}   "
+          f"writes/s {writes[0] / seconds:>7.0f}   errors {errors[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    run("default", Config, args.readers, args.seconds)
+    run("production", ProductionConfig, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,86 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
 
+    # Read-through cache of entity payloads: 'memory' (per process), 'redis' or 'none'
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'memory')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', 60))
+    CACHE_MAX_ENTRIES = 10000
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    # bcrypt cost for new hashes; older hashes are upgraded on the next login
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # None (hash on the request thread), 'thread' or 'process'
+    PASSWORD_HASH_EXECUTOR = os.getenv('PASSWORD_HASH_EXECUTOR') or None
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0)) or None
+
+    # Login throttling, as (attempts, per_seconds): 'memory' (per process) or 'redis'
+    LOGIN_RATE_LIMIT_STORAGE = os.getenv('LOGIN_RATE_LIMIT_STORAGE', 'memory')
+    LOGIN_RATE_LIMIT_URL = os.getenv('LOGIN_RATE_LIMIT_URL', 'redis://localhost:6379/1')
+    LOGIN_IP_LIMIT = (20, 60)
+    LOGIN_EMAIL_LIMIT = (10, 60)
+    LOGIN_FAILURE_LIMIT = (5, 300)
+
+    # Largest array accepted by the POST .../bulk endpoints
+    BULK_MAX_ITEMS = 1000
+
+    # Rows fetched per round trip by ?stream= list responses
+    STREAM_BATCH_SIZE = 1000
+
+    # API response encoder: None picks orjson when installed, else "json" (stdlib)
+    JSON_BACKEND = None
+
+    # JWT revocation: seconds a worker trusts its cached token_version per user
+    TOKEN_VERSION_TTL = 60
+
+    # Seconds a worker serves an in-process snapshot or index (the amenity catalog,
+    # the amenity bitmap, the geo grid) before rebuilding it from the DB: the bound
+    # on staleness after other workers' writes
+    SNAPSHOT_TTL = int(os.getenv('SNAPSHOT_TTL', 60))
+
+    # Read replicas of SQLALCHEMY_DATABASE_URI that serve reads. After a write,
+    # the client's requests stay on the primary for REPLICA_STICKY_SECONDS.
+    REPLICA_DATABASE_URIS = []
+    REPLICA_STICKY_SECONDS = 5
+
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    BCRYPT_LOG_ROUNDS = 4  # minimum cost keeps the suite fast
+
+class ProductionConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # comma-separated replica URLs, e.g. streaming replicas of a Postgres primary
+    REPLICA_DATABASE_URIS = [url for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url]
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        # one connection per worker thread; checked before use, recycled hourly
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': 30,
+        'pool_pre_ping': True,
+        'pool_recycle': 3600,
+    }
+    # Applied to each new SQLite connection (ignored for other databases):
+    # WAL lets readers run while a write is in progress, NORMAL syncs at
+    # checkpoints instead of every commit, busy_timeout waits for the write lock.
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,               # ms
+        'cache_size': -64000,               # KiB (64 MB page cache per connection)
+        'mmap_size': 256 * 1024 * 1024,     # bytes
+        'temp_store': 'MEMORY',
+    }
+
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
-}
\ No newline at end of file
+}
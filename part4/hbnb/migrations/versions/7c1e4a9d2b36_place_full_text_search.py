@@ -0,0 +1,50 @@
+"""place full-text search
+
+Revision ID: 7c1e4a9d2b36
+Revises: 469b2f0b9bfa
+Create Date: 2026-10-18 19:05:41.512204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4a9d2b36'
+down_revision = '469b2f0b9bfa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases have no search index
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("""CREATE VIRTUAL TABLE places_fts USING fts5(
+        title, description, content='places', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""")
+    op.execute("""CREATE TRIGGER places_fts_ai AFTER INSERT ON places BEGIN
+        INSERT INTO places_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""")
+    op.execute("""CREATE TRIGGER places_fts_ad AFTER DELETE ON places BEGIN
+        INSERT INTO places_fts(places_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""")
+    op.execute("""CREATE TRIGGER places_fts_au AFTER UPDATE OF title, description ON places BEGIN
+        INSERT INTO places_fts(places_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO places_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""")
+    # index the places that already exist
+    op.execute("INSERT INTO places_fts(places_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS places_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS places_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS places_fts_ai")
+    op.execute("DROP TABLE IF EXISTS places_fts")
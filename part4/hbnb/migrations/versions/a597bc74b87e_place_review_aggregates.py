@@ -0,0 +1,45 @@
+"""place review aggregates
+
+Revision ID: a597bc74b87e
+Revises: c9b45f0eb029
+Create Date: 2026-10-18 17:33:34.015377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a597bc74b87e'
+down_revision = 'c9b45f0eb029'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('review_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_places_review_count', ['review_count'], unique=False)
+
+    # existing places keep their reviews: start the aggregates from them, not from 0
+    op.execute(
+        "UPDATE places SET "
+        "review_count = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id), "
+        "rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews WHERE reviews.place_id = places.id)"
+    )
+
+    # expression index behind ?sort=rating (text must match Place.AVERAGE_RATING_SQL)
+    op.create_index(
+        'ix_places_average_rating', 'places',
+        [sa.text('coalesce(CAST(rating_sum AS FLOAT) / nullif(review_count, 0), 0)')],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_places_average_rating', table_name='places')
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        batch_op.drop_index('ix_places_review_count')
+        batch_op.drop_column('rating_sum')
+        batch_op.drop_column('review_count')
@@ -0,0 +1,29 @@
+"""index reviews in page order
+
+Revision ID: b5d83f1e6a47
+Revises: 7c1e4a9d2b36
+Create Date: 2026-10-18 21:04:11.520318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d83f1e6a47'
+down_revision = '7c1e4a9d2b36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # review pages are ordered and seeked by id: (place_id, created_at) filtered
+    # but left every page to sort all of the place's reviews
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_place_id_created_at')
+        batch_op.create_index('ix_reviews_place_id_id', ['place_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_place_id_id')
+        batch_op.create_index('ix_reviews_place_id_created_at', ['place_id', 'created_at'], unique=False)
@@ -0,0 +1,38 @@
+"""one review per user and place
+
+Revision ID: c9b45f0eb029
+Revises: d808151b91a5
+Create Date: 2026-10-18 17:33:21.877130
+
+"""
+import logging
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9b45f0eb029'
+down_revision = 'd808151b91a5'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def upgrade():
+    # the constraint cannot be added while duplicates exist: keep each user's
+    # latest review of a place, as a re-submitted review is the one they meant
+    deleted = op.get_bind().exec_driver_sql(
+        "DELETE FROM reviews WHERE id NOT IN "
+        "(SELECT MAX(id) FROM reviews GROUP BY user_id, place_id)"
+    ).rowcount
+    if deleted:
+        logger.warning("Deleted %d duplicate review(s), keeping each user's latest per place", deleted)
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_reviews_user_id_place_id', ['user_id', 'place_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_reviews_user_id_place_id', type_='unique')
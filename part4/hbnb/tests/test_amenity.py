@@ -2,7 +2,8 @@ import unittest
 
 from flask import request
 
-from app import create_app
+from app import create_app, db
+from app.services import facade
 
 
 class TestAmenityEndpoints(unittest.TestCase):
@@ -75,5 +76,99 @@ class TestAmenityEndpoints(unittest.TestCase):
         self.assertEqual(response.json['name'], "New Gym Name")
 
 
+class TestAmenityCatalogETag(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.wifi = facade.create_amenity({"name": "WiFi"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_if_none_match_returns_304(self):
+        """A matching If-None-Match short-circuits with 304 and no body"""
+        first = self.client.get('/api/v1/amenities/')
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers['ETag']
+        self.assertFalse(etag.startswith('W/'))
+
+        again = self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.data, b'')
+
+    def test_writes_change_the_etag(self):
+        """create_amenity/update_amenity publish a new catalog version"""
+        etag = self.client.get('/api/v1/amenities/').headers['ETag']
+
+        facade.create_amenity({"name": "Pool"})
+        resp = self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([a['name'] for a in resp.get_json()], ["WiFi", "Pool"])
+
+        etag = resp.headers['ETag']
+        facade.update_amenity(self.wifi.id, {"name": "Fast WiFi"})
+        resp = self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()[0]['name'], "Fast WiFi")
+
+
+    def test_other_workers_writes_show_up_after_ttl(self):
+        """A write that bypasses this process's bump() is served once the snapshot expires"""
+        etag = self.client.get('/api/v1/amenities/').headers['ETag']
+        # as another worker would: the row is committed, this process is not told
+        db.session.execute(db.text("INSERT INTO amenities (name) VALUES ('Pool')"))
+        db.session.commit()
+
+        resp = self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 304)
+
+        facade._amenity_catalog().ttl = 0
+        resp = self.client.get('/api/v1/amenities/', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([a['name'] for a in resp.get_json()], ["WiFi", "Pool"])
+
+class TestAmenityBulkCreate(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        facade.create_amenity({"name": "WiFi"})
+        facade.create_user({
+            "first_name": "Admin", "last_name": "User",
+            "email": "admin@test.com", "password": "secret", "is_admin": True
+        })
+        token = self.client.post('/api/v1/auth/login', json={
+            "email": "admin@test.com", "password": "secret"
+        }).get_json()['access_token']
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_bulk_create_skips_duplicates(self):
+        """Names already stored or repeated in the batch are reported, the rest inserted"""
+        etag = self.client.get('/api/v1/amenities/').headers['ETag']
+        resp = self.client.post('/api/v1/amenities/bulk', headers=self.headers, json=[
+            {"name": "Pool"}, {"name": "WiFi"}, {"name": " Pool "}, {"name": ""}, {"name": "Sauna"}
+        ])
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.get_json()['created'], 2)
+
+        catalog = self.client.get('/api/v1/amenities/')
+        self.assertNotEqual(catalog.headers['ETag'], etag)
+        self.assertEqual(sorted(a['name'] for a in catalog.get_json()), ["Pool", "Sauna", "WiFi"])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import text
+from app import create_app, db
+from app.api import representations
+from config import ProductionConfig
+
+
+class TestProductionConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        config = type("TmpProductionConfig", (ProductionConfig,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.tmp.name, 'hbnb.db')}",
+        })
+        self.app = create_app(config)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        self.tmp.cleanup()
+
+    def _pragma(self, name):
+        return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_sqlite_pragmas_applied(self):
+        """Every pooled connection runs in WAL mode with the configured pragmas"""
+        self.assertEqual(self._pragma("journal_mode"), "wal")
+        self.assertEqual(self._pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self._pragma("busy_timeout"), 5000)
+        self.assertEqual(self._pragma("cache_size"), -64000)
+
+    def test_engine_options(self):
+        """Pool sizing and pre-ping come from SQLALCHEMY_ENGINE_OPTIONS"""
+        self.assertEqual(db.engine.pool.size(), ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS['pool_size'])
+        self.assertTrue(db.engine.pool._pre_ping)
+
+
+
+class TestJsonBackend(unittest.TestCase):
+
+    PAYLOAD = {"at": datetime(2025, 1, 2, 3, 4, 5, 6), "price": Decimal("12.50"), 7: "int key"}
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_backends_agree(self):
+        """orjson and the stdlib fallback encode datetimes, Decimals and int keys alike"""
+        encoded = {}
+        for name in representations.BACKENDS:
+            if name == "orjson" and representations.orjson is None:
+                continue
+            self.app.config["JSON_BACKEND"] = name
+            encoded[name] = json.loads(representations.dumps(self.PAYLOAD))
+        self.assertEqual(encoded["json"], {"at": "2025-01-02T03:04:05.000006", "price": 12.5, "7": "int key"})
+        self.assertEqual(len(set(map(json.dumps, encoded.values()))), 1)
+
+    def test_api_uses_the_representation(self):
+        self.app.config["JSON_BACKEND"] = "json"
+        resp = self.client.get('/api/v1/users/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, 'application/json')
+        self.assertEqual(resp.get_json(), [])
+
+        self.app.config["JSON_BACKEND"] = "msgpack"
+        with self.assertRaises(ValueError):
+            representations.dumps({})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,14 @@
+import json
+import os
+import shutil
+import tempfile
 import unittest
-from app import create_app
+from sqlalchemy import event
+from app import create_app, db
+from app.models import serializers
+from app.services import facade
+from app.services.amenity_index import AmenityBitmapIndex, bitmap_from_ids, bitmap_ids
+from app.services.geo_index import GeoGridIndex
 
 
 class TestPlaceEndpoints(unittest.TestCase):
@@ -72,4 +81,882 @@ class TestPlaceEndpoints(unittest.TestCase):
     def test_place_not_found(self):
         """Test retrieving a place that does not exist"""
         response = self.client.get('/api/v1/places/invalid-id')
-        self.assertEqual(response.status_code, 404)
\ No newline at end of file
+        self.assertEqual(response.status_code, 404)
+
+
+class TestPlaceListPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.wifi = facade.create_amenity({"name": "WiFi"})
+        self.place_ids = []
+        for i in range(5):
+            place = facade.create_place({
+                "title": f"Place {i}", "price": 10.0 * (i + 1),
+                "latitude": 0.0, "longitude": 0.0, "user_id": owner.id,
+                "amenities": [self.wifi.id] if i % 2 == 0 else []
+            })
+            self.place_ids.append(place.id)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_cursor_walks_every_place_once(self):
+        """Following next_cursor returns each place exactly once"""
+        seen, cursor = [], None
+        while True:
+            url = '/api/v1/places/?limit=2' + (f'&cursor={cursor}' if cursor else '')
+            body = self.client.get(url).get_json()
+            self.assertLessEqual(len(body['places']), 2)
+            seen.extend(p['id'] for p in body['places'])
+            cursor = body['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.place_ids)
+
+    def test_price_and_amenity_filters(self):
+        """min_price/max_price/amenity are applied server-side"""
+        body = self.client.get('/api/v1/places/?min_price=20&max_price=40').get_json()
+        self.assertEqual([p['price'] for p in body['places']], [20.0, 30.0, 40.0])
+
+        body = self.client.get(f'/api/v1/places/?amenity={self.wifi.id}').get_json()
+        self.assertEqual([p['id'] for p in body['places']], self.place_ids[::2])
+
+    def test_invalid_query_params(self):
+        """Malformed pagination params are rejected"""
+        self.assertEqual(self.client.get('/api/v1/places/?limit=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?limit=0').status_code, 400)
+
+    def test_stream_ndjson(self):
+        """?stream=ndjson sends every matching place, one per line, ignoring limit"""
+        self.app.config["STREAM_BATCH_SIZE"] = 2
+        resp = self.client.get(f'/api/v1/places/?stream=ndjson&limit=1&cursor={self.place_ids[0]}')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, 'application/x-ndjson')
+        self.assertTrue(resp.is_streamed)
+        rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        self.assertEqual([p['id'] for p in rows], self.place_ids[1:])
+        self.assertEqual(rows[0], serializers.PLACE(facade.get_place(self.place_ids[1])))
+
+    def test_stream_json_array(self):
+        """?stream=json sends one JSON array with the same filters as the paged list"""
+        resp = self.client.get(f'/api/v1/places/?stream=json&amenity={self.wifi.id}&min_price=20')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([p['id'] for p in resp.get_json()], self.place_ids[2::2])
+
+        empty = self.client.get('/api/v1/places/?stream=json&min_price=1000')
+        self.assertEqual(empty.get_json(), [])
+        self.assertEqual(self.client.get('/api/v1/places/?stream=csv').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?stream=json&sort=x').status_code, 400)
+
+
+
+class TestPlaceAmenityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.wifi = facade.create_amenity({"name": "WiFi"})
+        self.pool = facade.create_amenity({"name": "Pool"})
+        # place i: WiFi when i is even, Pool when i is a multiple of 3
+        self.place_ids = []
+        for i in range(7):
+            amenities = [a.id for a, on in ((self.wifi, i % 2 == 0), (self.pool, i % 3 == 0)) if on]
+            place = facade.create_place({
+                "title": f"Place {i}", "price": 10.0 * (i + 1),
+                "latitude": 0.0, "longitude": 0.0, "user_id": self.owner.id,
+                "amenities": amenities
+            })
+            self.place_ids.append(place.id)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _ids(self, query):
+        resp = self.client.get(f'/api/v1/places/?{query}')
+        self.assertEqual(resp.status_code, 200)
+        return [p['id'] for p in resp.get_json()['places']]
+
+    def test_all_and_any(self):
+        both = f"{self.wifi.id},{self.pool.id}"
+        self.assertEqual(self._ids(f'amenities={both}'), [self.place_ids[0], self.place_ids[6]])
+        self.assertEqual(self._ids(f'amenities={both}&amenities_match=any'),
+                         [self.place_ids[i] for i in (0, 2, 3, 4, 6)])
+        self.assertEqual(self._ids(f'amenities={self.pool.id},999'), [])
+        self.assertEqual(self.client.get(f'/api/v1/places/?amenities={both}&amenities_match=x').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?amenities=1,a').status_code, 400)
+
+    def test_pages_straight_from_the_bitmap(self):
+        """Without other filters a page is one primary-key lookup, and cursors still work"""
+        wifi_id = self.wifi.id
+        facade.get_places_page(amenity_ids=[wifi_id])  # build the index first
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            body = self.client.get(f'/api/v1/places/?amenities={wifi_id}&limit=2').get_json()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual([p['id'] for p in body['places']], self.place_ids[0:3:2])
+
+        rest = self._ids(f"amenities={wifi_id}&cursor={body['next_cursor']}")
+        self.assertEqual(rest, self.place_ids[4::2])
+
+    def test_combined_with_sql_filters(self):
+        query = f'amenities={self.wifi.id},{self.pool.id}&amenities_match=any'
+        self.assertEqual(self._ids(f'{query}&min_price=40'), [self.place_ids[i] for i in (3, 4, 6)])
+        self.assertEqual(self._ids(f'{query}&sort=review_count&limit=1'), [self.place_ids[0]])
+
+    def test_index_follows_new_places(self):
+        facade.get_places_page(amenity_ids=[self.pool.id])  # build the index first
+        results = facade.create_places_bulk(self.owner.id, [
+            {"title": "Villa", "price": 500.0, "latitude": 0.0, "longitude": 0.0,
+             "amenities": [self.wifi.id, self.pool.id]}
+        ])
+        self.assertEqual(self._ids(f'amenities={self.wifi.id},{self.pool.id}'),
+                         [self.place_ids[0], self.place_ids[6], results[0]["id"]])
+
+    def test_index_picks_up_other_workers_writes(self):
+        """Links written without this process's set_place() are seen after SNAPSHOT_TTL"""
+        query = f'amenities={self.wifi.id},{self.pool.id}'
+        self.assertEqual(self._ids(query), [self.place_ids[0], self.place_ids[6]])
+        db.session.execute(db.text("INSERT INTO place_amenity VALUES (:p, :a)"),
+                           {"p": self.place_ids[2], "a": self.pool.id})
+        db.session.commit()
+        self.assertEqual(self._ids(query), [self.place_ids[0], self.place_ids[6]])
+
+        self.app.config["SNAPSHOT_TTL"] = 0
+        self.assertEqual(self._ids(query), [self.place_ids[i] for i in (0, 2, 6)])
+
+    def test_bitmap_ids(self):
+        self.assertEqual(bitmap_ids(0), [])
+        self.assertEqual(bitmap_ids((1 << 100_000) | 0b1010), [1, 3, 100_000])
+        ids = [0, 7, 8, 10, 255, 256, 4097]
+        self.assertEqual(bitmap_ids(bitmap_from_ids(ids)), ids)
+        self.assertEqual(bitmap_from_ids(ids), sum(1 << i for i in ids))
+
+    def test_rebuild_keeps_writes_made_while_it_loads(self):
+        """A set_place() between claim_refresh() and rebuild() survives the swap"""
+        index = AmenityBitmapIndex()
+        index.rebuild([(1, 5)])
+        self.assertTrue(index.claim_refresh(0))
+        stale_rows = [(1, 5)]  # read before place 2 was committed
+        index.set_place(2, [5])
+        index.rebuild(stale_rows)
+        self.assertEqual(bitmap_ids(index.match([5])), [1, 2])
+
+
+class TestPlaceAmenityAttachment(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner_id = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        }).id
+        self.amenity_ids = [
+            a["id"] for a in facade.create_amenities_bulk([{"name": f"A{i}"} for i in range(30)])
+        ]
+        self.place_data = {"title": "Loft", "price": 90.0, "latitude": 1.0, "longitude": 1.0,
+                           "user_id": self.owner_id}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_create_resolves_amenities_in_one_query(self):
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            if "FROM amenities" in statement:
+                statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            place = facade.create_place(dict(self.place_data, amenities=self.amenity_ids))
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual([a.id for a in place.amenities], self.amenity_ids)
+
+    def test_unknown_ids_are_reported_together(self):
+        with self.assertRaises(ValueError) as ctx:
+            facade.create_place(dict(self.place_data, amenities=[self.amenity_ids[0], 998, 999]))
+        self.assertEqual(str(ctx.exception), "Unknown amenity IDs: [998, 999]")
+        self.assertEqual(facade.get_all_places(), [])
+
+    def test_update_replaces_amenities(self):
+        place_id = facade.create_place(dict(self.place_data, amenities=self.amenity_ids[:2])).id
+        etag = self.client.get(f'/api/v1/places/{place_id}').headers['ETag']
+
+        facade.update_place(place_id, {"amenities": self.amenity_ids[1:3]})
+        resp = self.client.get(f'/api/v1/places/{place_id}', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([a['id'] for a in resp.get_json()['amenities']], self.amenity_ids[1:3])
+        places, _ = facade.get_places_page(amenity_ids=[self.amenity_ids[0]])
+        self.assertEqual(places, [])
+
+        with self.assertRaises(ValueError):
+            facade.update_place(place_id, {"title": "Renamed", "amenities": [999]})
+        self.assertEqual(facade.get_place(place_id).title, "Loft")
+
+
+class TestPlaceDetailQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.amenity_ids = [facade.create_amenity({"name": n}).id for n in ("WiFi", "Pool")]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _place_with_reviews(self, n_reviews):
+        place = facade.create_place({
+            "title": f"{n_reviews} reviews", "price": 80.0, "latitude": 0.0,
+            "longitude": 0.0, "user_id": self.owner.id, "amenities": self.amenity_ids
+        })
+        for i in range(n_reviews):
+            guest = facade.create_user({
+                "first_name": "Guest", "last_name": str(i),
+                "email": f"guest{n_reviews}-{i}@hbnb.com", "password": "secret"
+            })
+            facade.create_review({
+                "text": "Nice", "rating": 5, "user_id": guest.id, "place_id": place.id
+            })
+        return place.id
+
+    def _count_detail_queries(self, place_id):
+        db.session.expire_all()
+        statements = []
+
+        def count(*args):
+            statements.append(args[2])
+
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            place = facade.get_place_detail(place_id)
+            data = serializers.PLACE_DETAIL(place)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        return len(statements), data
+
+    def test_query_count_independent_of_review_count(self):
+        """get_place_detail + serialization issue the same number of queries for 1 or 10 reviews"""
+        few_queries, few = self._count_detail_queries(self._place_with_reviews(1))
+        many_queries, many = self._count_detail_queries(self._place_with_reviews(10))
+
+        self.assertEqual(len(few["reviews"]), 1)
+        self.assertEqual(len(many["reviews"]), 10)
+        self.assertEqual(len(many["amenities"]), 2)
+        self.assertEqual(many["reviews"][0]["user_name"], "Guest 0")
+        self.assertEqual(few_queries, many_queries)
+        self.assertLessEqual(many_queries, 3)
+
+
+
+class TestPlaceRatingAggregates(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.guests = [
+            facade.create_user({
+                "first_name": "Guest", "last_name": str(i),
+                "email": f"guest{i}@hbnb.com", "password": "secret"
+            })
+            for i in range(3)
+        ]
+        self.places = [
+            facade.create_place({
+                "title": f"Place {i}", "price": 50.0, "latitude": 0.0,
+                "longitude": 0.0, "user_id": owner.id
+            })
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _review(self, guest, place, rating):
+        return facade.create_review({
+            "text": "ok", "rating": rating, "user_id": guest.id, "place_id": place.id
+        })
+
+    def test_aggregates_follow_review_writes(self):
+        """create/update/delete_review keep review_count and rating_sum in step"""
+        place = self.places[0]
+        first = self._review(self.guests[0], place, 5)
+        self._review(self.guests[1], place, 2)
+        self.assertEqual((place.review_count, place.rating_sum), (2, 7))
+        self.assertEqual(serializers.PLACE(place)["average_rating"], 3.5)
+
+        facade.update_review(first.id, {"rating": 3})
+        self.assertEqual((place.review_count, place.rating_sum), (2, 5))
+
+        facade.delete_review(first.id)
+        self.assertEqual((place.review_count, place.rating_sum), (1, 2))
+
+    def test_sort_by_rating_paginated(self):
+        """?sort=rating orders best-rated first and the cursor continues that order"""
+        self._review(self.guests[0], self.places[0], 2)
+        self._review(self.guests[0], self.places[2], 5)
+        self._review(self.guests[1], self.places[2], 4)
+
+        first = self.client.get('/api/v1/places/?sort=rating&limit=2').get_json()
+        cursor = first['next_cursor']
+        rest = self.client.get(f'/api/v1/places/?sort=rating&limit=2&cursor={cursor}').get_json()
+
+        ordered = [p['id'] for p in first['places'] + rest['places']]
+        self.assertEqual(ordered, [self.places[2].id, self.places[0].id, self.places[1].id])
+        self.assertIsNone(rest['next_cursor'])
+
+    def test_invalid_sort_key(self):
+        """Unknown sort keys are rejected"""
+        self.assertEqual(self.client.get('/api/v1/places/?sort=bogus').status_code, 400)
+
+
+class TestPlaceGeoSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        coords = {
+            "louvre": (48.8606, 2.3376),
+            "eiffel": (48.8584, 2.2945),
+            "versailles": (48.8049, 2.1204),
+            "london": (51.5072, -0.1276),
+        }
+        self.places = {
+            name: facade.create_place({
+                "title": name, "price": 100.0, "latitude": lat,
+                "longitude": lon, "user_id": owner.id
+            })
+            for name, (lat, lon) in coords.items()
+        }
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _nearby(self, radius_km):
+        resp = self.client.get(f'/api/v1/places/nearby?lat=48.8606&lon=2.3376&radius_km={radius_km}')
+        self.assertEqual(resp.status_code, 200)
+        return [p['title'] for p in resp.get_json()['places']]
+
+    def test_nearby_sorted_by_distance(self):
+        """Radius search refines with haversine and orders nearest first"""
+        self.assertEqual(self._nearby(5), ["louvre", "eiffel"])
+        self.assertEqual(self._nearby(30), ["louvre", "eiffel", "versailles"])
+
+    def test_index_follows_place_updates(self):
+        """Moving a place updates the in-process grid index"""
+        facade.update_place(self.places["eiffel"].id, {"latitude": 51.5, "longitude": -0.12})
+        self.assertEqual(self._nearby(5), ["louvre"])
+
+    def test_index_picks_up_other_workers_writes(self):
+        """Places moved without this process's index update are seen after SNAPSHOT_TTL"""
+        self.assertEqual(self._nearby(5), ["louvre", "eiffel"])
+        db.session.execute(db.text("UPDATE places SET latitude = 48.86, longitude = 2.34 WHERE id = :id"),
+                           {"id": self.places["london"].id})
+        db.session.commit()
+        self.assertEqual(self._nearby(5), ["louvre", "eiffel"])
+
+        self.app.config["SNAPSHOT_TTL"] = 0
+        self.assertEqual(self._nearby(5), ["louvre", "london", "eiffel"])
+
+    def test_rebuild_keeps_writes_made_while_it_loads(self):
+        """An add() between claim_refresh() and rebuild() survives the swap"""
+        index = GeoGridIndex()
+        index.rebuild([(1, 48.86, 2.34)])
+        self.assertTrue(index.claim_refresh(0))
+        stale_rows = [(1, 48.86, 2.34)]  # read before place 2 was committed
+        index.add(2, 48.861, 2.341)
+        index.remove(1)
+        index.rebuild(stale_rows)
+        self.assertEqual([pid for pid, _ in index.within_radius(48.86, 2.34, 1)], [2])
+
+    def test_bbox_filter(self):
+        """?bbox= filters the listing with a lat/lon range query"""
+        body = self.client.get('/api/v1/places/?bbox=2.2,48.8,2.4,48.9').get_json()
+        self.assertEqual(sorted(p['title'] for p in body['places']), ["eiffel", "louvre"])
+        self.assertEqual(self.client.get('/api/v1/places/?bbox=1,2,3').status_code, 400)
+
+    def test_nearby_requires_coordinates(self):
+        """lat, lon and radius_km are mandatory"""
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=1').status_code, 400)
+
+
+class TestPlaceDetailCache(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.guest = facade.create_user({
+            "first_name": "Guest", "last_name": "User",
+            "email": "guest@hbnb.com", "password": "secret"
+        })
+        self.place = facade.create_place({
+            "title": "Cached", "price": 80.0, "latitude": 0.0,
+            "longitude": 0.0, "user_id": self.owner.id
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _detail(self):
+        return self.client.get(f'/api/v1/places/{self.place.id}').get_json()
+
+    def test_second_read_is_a_cache_hit(self):
+        """Repeated detail reads are served from the cache"""
+        facade.create_user({
+            "first_name": "Admin", "last_name": "User",
+            "email": "admin@hbnb.com", "password": "secret", "is_admin": True
+        })
+        token = self.client.post('/api/v1/auth/login', json={
+            "email": "admin@hbnb.com", "password": "secret"
+        }).get_json()['access_token']
+        headers = {"Authorization": f"Bearer {token}"}
+
+        self._detail()
+        before = self.client.get('/stats', headers=headers).get_json()['cache']
+        self._detail()
+        after = self.client.get('/stats', headers=headers).get_json()['cache']
+        self.assertEqual(after['hits'], before['hits'] + 1)
+        self.assertEqual(after['misses'], before['misses'])
+
+    def test_writes_invalidate_place_detail(self):
+        """Place updates, new reviews and owner renames drop the cached detail"""
+        self.assertEqual(self._detail()['reviews'], [])
+
+        facade.update_place(self.place.id, {"title": "Renamed"})
+        self.assertEqual(self._detail()['title'], "Renamed")
+
+        facade.create_review({
+            "text": "Great", "rating": 5, "user_id": self.guest.id, "place_id": self.place.id
+        })
+        detail = self._detail()
+        self.assertEqual(len(detail['reviews']), 1)
+        self.assertEqual(detail['review_count'], 1)
+
+        facade.update_user(self.owner.id, {"first_name": "Renamed"})
+        self.assertEqual(self._detail()['owner']['first_name'], "Renamed")
+
+    def test_conditional_get(self):
+        """ETag/Last-Modified validators cover the place and its reviews"""
+        first = self.client.get(f'/api/v1/places/{self.place.id}')
+        etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+
+        resp = self.client.get(f'/api/v1/places/{self.place.id}', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 304)
+        resp = self.client.get(f'/api/v1/places/{self.place.id}',
+                               headers={'If-Modified-Since': last_modified})
+        self.assertEqual(resp.status_code, 304)
+
+        facade.create_review({
+            "text": "Great", "rating": 5, "user_id": self.guest.id, "place_id": self.place.id
+        })
+        resp = self.client.get(f'/api/v1/places/{self.place.id}', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers['ETag'], etag)
+
+
+class TestPlaceBulkCreate(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app.config["BULK_MAX_ITEMS"] = 5
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.wifi = facade.create_amenity({"name": "WiFi"})
+        token = self.client.post('/api/v1/auth/login', json={
+            "email": "owner@hbnb.com", "password": "secret"
+        }).get_json()['access_token']
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _place(self, title, **extra):
+        return dict({"title": title, "price": 80.0, "latitude": 48.85, "longitude": 2.35}, **extra)
+
+    def test_bulk_create_reports_each_item(self):
+        """Valid items are inserted together; invalid ones get an error at their index"""
+        resp = self.client.post('/api/v1/places/bulk', headers=self.headers, json=[
+            self._place("A", amenities=[self.wifi.id]),
+            self._place("B", latitude=123),
+            self._place("C", amenities=[999]),
+            self._place("D"),
+        ])
+        self.assertEqual(resp.status_code, 201)
+        body = resp.get_json()
+        self.assertEqual((body['created'], body['failed']), (2, 2))
+        self.assertIn('latitude', body['results'][1]['error'])
+        self.assertIn('999', body['results'][2]['error'])
+
+        first = facade.get_place_detail(body['results'][0]['id'])
+        self.assertEqual(first.user_id, self.owner.id)
+        self.assertEqual([a.name for a in first.amenities], ["WiFi"])
+        self.assertEqual(len(facade.get_all_places()), 2)
+
+        nearby = facade.get_places_nearby(48.85, 2.35, 1)
+        self.assertEqual({p.title for p, _ in nearby}, {"A", "D"})
+
+    def test_bulk_create_rejects_bad_fields_per_item(self):
+        """Wrongly typed or oversized fields fail their item, not the whole batch"""
+        resp = self.client.post('/api/v1/places/bulk', headers=self.headers, json=[
+            self._place("A", description={"a": 1}),
+            self._place("B" * 101),
+            self._place("C", description="x" * 1025),
+            self._place("D", amenities=[True]),
+            self._place("E", description="fine"),
+        ])
+        self.assertEqual(resp.status_code, 201)
+        body = resp.get_json()
+        self.assertEqual((body['created'], body['failed']), (1, 4))
+        self.assertIn('description', body['results'][0]['error'])
+        self.assertIn('100', body['results'][1]['error'])
+        self.assertIn('1024', body['results'][2]['error'])
+        self.assertIn('amenities', body['results'][3]['error'])
+        self.assertEqual([p.title for p in facade.get_all_places()], ["E"])
+
+    def test_bulk_create_limits(self):
+        """Empty, non-array and oversized bodies are rejected as a whole"""
+        self.assertEqual(self.client.post('/api/v1/places/bulk', headers=self.headers, json=[]).status_code, 400)
+        self.assertEqual(
+            self.client.post('/api/v1/places/bulk', headers=self.headers, json=self._place("A")).status_code, 400
+        )
+        resp = self.client.post('/api/v1/places/bulk', headers=self.headers,
+                                json=[self._place(str(i)) for i in range(6)])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(facade.get_all_places(), [])
+
+
+class TestFacadeTransaction(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.guest = facade.create_user({
+            "first_name": "Guest", "last_name": "User",
+            "email": "guest@hbnb.com", "password": "secret"
+        })
+        self.commits = 0
+        event.listen(db.session, "after_commit", self._count_commit)
+
+    def tearDown(self):
+        event.remove(db.session, "after_commit", self._count_commit)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _count_commit(self, session):
+        self.commits += 1
+
+    def _place_data(self, title="Loft"):
+        return {"title": title, "price": 90.0, "latitude": 45.0, "longitude": 5.0,
+                "user_id": self.owner.id}
+
+    def test_composite_operation_commits_once(self):
+        """Writes inside facade.transaction() are flushed and committed together"""
+        with facade.transaction():
+            place = facade.create_place(self._place_data())
+            self.assertIsNotNone(place.id)  # flushed: id already assigned
+            facade.create_review({"text": "Nice", "rating": 4,
+                                  "user_id": self.guest.id, "place_id": place.id})
+            self.assertEqual(self.commits, 0)
+        self.assertEqual(self.commits, 1)
+
+        db.session.expire_all()
+        self.assertEqual(facade.get_place(place.id).review_count, 1)
+        self.assertEqual([p.title for p, _ in facade.get_places_nearby(45.0, 5.0, 1)], ["Loft"])
+
+    def test_error_rolls_back_everything(self):
+        """An exception discards the whole unit, including deferred cache/index updates"""
+        with self.assertRaises(ValueError):
+            with facade.transaction():
+                facade.create_place(self._place_data())
+                facade.create_place(dict(self._place_data("Ghost"), user_id=999))
+        self.assertEqual(self.commits, 0)
+        self.assertEqual(facade.get_all_places(), [])
+        self.assertEqual(facade.get_places_nearby(45.0, 5.0, 1), [])
+
+    def test_invalidation_waits_for_commit(self):
+        """A cached payload is only dropped once the unit commits"""
+        place = facade.create_place(self._place_data())
+        self.client.get(f'/api/v1/places/{place.id}')
+
+        with facade.transaction():
+            facade.create_review({"text": "Nice", "rating": 5,
+                                  "user_id": self.guest.id, "place_id": place.id})
+            payload, _ = facade.get_place_payload(place.id)
+            self.assertEqual(payload['reviews'], [])
+        payload, _ = facade.get_place_payload(place.id)
+        self.assertEqual(len(payload['reviews']), 1)
+
+
+class TestReadReplicaRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        primary = os.path.join(self.tmp.name, "primary.db")
+        self.replica = os.path.join(self.tmp.name, "replica.db")
+        self.app = create_app(type("ReplicaConfig", (object,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary}",
+            "REPLICA_DATABASE_URIS": [f"sqlite:///{self.replica}"],
+            "BCRYPT_LOG_ROUNDS": 4,
+            "SECRET_KEY": "test",
+        }))
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner_id = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        }).id
+        facade.create_place(self._place("Replicated"))
+        # the "replica" is a snapshot of the primary that never catches up
+        db.session.remove()
+        db.engine.dispose()
+        shutil.copy(primary, self.replica)
+        facade.create_place(self._place("Primary only"))
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        for engine in [db.engine] + self.app.extensions["hbnb_replica_engines"]:
+            engine.dispose()
+        self.app_context.pop()
+        self.tmp.cleanup()
+
+    def _place(self, title):
+        return {"title": title, "price": 10.0, "latitude": 1.0, "longitude": 1.0,
+                "user_id": self.owner_id}
+
+    def _titles(self):
+        return [p['title'] for p in self.client.get('/api/v1/places/').get_json()['places']]
+
+    def test_reads_use_the_replica(self):
+        """Listings are served by the replica, writes land on the primary"""
+        self.assertEqual(self._titles(), ["Replicated"])
+        self.assertEqual(len(facade.get_all_places()), 1)
+        with facade.transaction():
+            self.assertEqual(len(facade.get_all_places()), 2)
+
+    def test_writers_read_their_writes(self):
+        """After a write the same client is pinned to the primary"""
+        token = self.client.post('/api/v1/auth/login', json={
+            "email": "owner@hbnb.com", "password": "secret"
+        }).get_json()['access_token']
+        resp = self.client.post('/api/v1/places/', headers={"Authorization": f"Bearer {token}"},
+                                json={"title": "Mine", "price": 10.0, "latitude": 1.0, "longitude": 1.0})
+        self.assertEqual(resp.status_code, 201)
+        self.assertIsNotNone(self.client.get_cookie('hbnb_primary'))
+
+        # the test's app context outlives requests: drop the session as a new request would
+        db.session.remove()
+        self.assertEqual(self._titles(), ["Replicated", "Primary only", "Mine"])
+
+        self.client.delete_cookie('hbnb_primary')
+        db.session.remove()
+        self.assertEqual(self._titles(), ["Replicated"])
+
+
+class TestPlaceSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.cabin = facade.create_place({
+            "title": "Cabin", "description": "Wooden cabin with a loft near the sea",
+            "price": 50.0, "latitude": 0.0, "longitude": 0.0, "user_id": self.owner.id
+        })
+        self.loft = facade.create_place({
+            "title": "Seaside loft", "description": "Bright loft",
+            "price": 90.0, "latitude": 0.0, "longitude": 0.0, "user_id": self.owner.id
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _search(self, query):
+        resp = self.client.get(f'/api/v1/places/search?{query}')
+        self.assertEqual(resp.status_code, 200)
+        return resp.get_json()
+
+    def test_title_matches_rank_first(self):
+        body = self._search('q=loft')
+        self.assertEqual([p['id'] for p in body['places']], [self.loft.id, self.cabin.id])
+        self.assertEqual(body['places'][0]['title'], "Seaside loft")
+
+    def test_all_words_and_prefixes(self):
+        """Every word must match; a trailing * matches a prefix"""
+        self.assertEqual([p['id'] for p in self._search('q=wooden+loft')['places']], [self.cabin.id])
+        self.assertEqual([p['id'] for p in self._search('q=sea')['places']], [self.cabin.id])
+        self.assertEqual(len(self._search('q=sea*')['places']), 2)
+
+    def test_cursor_pages_in_rank_order(self):
+        first = self._search('q=loft&limit=1')
+        second = self._search(f"q=loft&limit=1&cursor={first['next_cursor']}")
+        self.assertEqual([p['id'] for p in first['places'] + second['places']],
+                         [self.loft.id, self.cabin.id])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_index_follows_writes(self):
+        """Triggers keep the index in step with updates and bulk inserts"""
+        facade.update_place(self.cabin.id, {"title": "Chalet", "description": "Mountain views"})
+        facade.create_places_bulk(self.owner.id, [
+            {"title": "Mountain hut", "price": 20.0, "latitude": 0.0, "longitude": 0.0}
+        ])
+        self.assertEqual([p['id'] for p in self._search('q=loft')['places']], [self.loft.id])
+        self.assertEqual(len(self._search('q=mountain')['places']), 2)
+
+    def test_query_syntax_is_not_interpreted(self):
+        # quotes, parentheses and operators are just word separators / plain words
+        self.assertEqual(self._search('q=(loft"')['places'][0]['id'], self.loft.id)
+        self.assertEqual(self._search('q=loft%20OR%20chalet')['places'], [])
+        self.assertEqual(self.client.get('/api/v1/places/search?q=*').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/search').status_code, 400)
+
+
+class TestPlaceOwnership(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        for name in ("owner", "other"):
+            facade.create_user({
+                "first_name": name, "last_name": "User",
+                "email": f"{name}@hbnb.com", "password": "secret"
+            })
+        self.place = facade.create_place({
+            "title": "Loft", "price": 90.0, "latitude": 1.0, "longitude": 1.0,
+            "user_id": facade.get_user_by_email("owner@hbnb.com").id
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _headers(self, name):
+        token = self.client.post('/api/v1/auth/login', json={
+            "email": f"{name}@hbnb.com", "password": "secret"
+        }).get_json()['access_token']
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_ownership_uses_integer_ids(self):
+        """The JWT subject is compared to Place.user_id as an integer"""
+        data = {"title": "Renamed", "price": 90.0, "latitude": 1.0, "longitude": 1.0}
+        url = f'/api/v1/places/{self.place.id}'
+        self.assertEqual(self.client.put(url, json=data, headers=self._headers("other")).status_code, 403)
+        resp = self.client.put(url, json=data, headers=self._headers("owner"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsInstance(resp.get_json()['user_id'], int)
+
+    def test_non_integer_id_is_404(self):
+        """Ids are integers in the URL too: anything else never reaches the database"""
+        self.assertEqual(self.client.get('/api/v1/places/not-an-id').status_code, 404)
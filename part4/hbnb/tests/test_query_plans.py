@@ -0,0 +1,187 @@
+import os
+import tempfile
+import unittest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import upgrade
+from sqlalchemy import event, inspect
+from app import create_app, db
+from app.services import facade
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.app = create_app(type("MigrationConfig", (object,), {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.tmp.name, 'hbnb.db')}",
+            "SECRET_KEY": "test",
+        }))
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        self.tmp.cleanup()
+
+    def test_upgrade_matches_models(self):
+        """flask db upgrade builds exactly the schema the models declare"""
+        upgrade(directory=MIGRATIONS)
+        # the same filters `flask db migrate` uses (e.g. skipping the FTS5 tables)
+        opts = {"include_name": self.app.extensions["migrate"].configure_args["include_name"]}
+        with db.engine.connect() as conn:
+            diff = compare_metadata(MigrationContext.configure(conn, opts=opts), db.metadata)
+            schema = {
+                row[0] for row in
+                conn.exec_driver_sql("SELECT name FROM sqlite_master")
+            }
+        self.assertEqual(diff, [])
+        # expression indexes, virtual tables and triggers can't be reflected: check by name
+        self.assertIn("ix_places_average_rating", schema)
+        self.assertTrue({"places_fts", "places_fts_ai", "places_fts_ad", "places_fts_au"} <= schema)
+        self.assertIn("alembic_version", inspect(db.engine).get_table_names())
+
+
+    def test_upgrade_from_baseline_database(self):
+        """A database from before the migrations upgrades in place; duplicate reviews are dropped"""
+        upgrade(directory=MIGRATIONS, revision="09cb2dffe7e6")
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO users (id, first_name, last_name, email, password, is_admin) "
+                "VALUES (1, 'A', 'B', 'a@b.c', 'x', 0)"
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO places (id, title, price, latitude, longitude, user_id) "
+                "VALUES (1, 'Loft', 90, 1, 1, 1)"
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO reviews (id, text, rating, user_id, place_id) "
+                "VALUES (1, 'old', 2, 1, 1), (2, 'new', 5, 1, 1)"
+            )
+
+        upgrade(directory=MIGRATIONS)
+        with db.engine.connect() as conn:
+            reviews = conn.exec_driver_sql("SELECT id, text FROM reviews").all()
+            token_version = conn.exec_driver_sql("SELECT token_version FROM users").scalar()
+        self.assertEqual(reviews, [(2, "new")])
+        self.assertEqual(token_version, 0)
+        self.assertEqual([p.title for p in facade.search_places("loft")[0]], ["Loft"])
+        # aggregates are backfilled from the reviews that survived
+        place = facade.get_place(1)
+        self.assertEqual((place.review_count, place.rating_sum, place.average_rating), (1, 5, 5.0))
+
+class TestQueryPlans(unittest.TestCase):
+    """EXPLAIN QUERY PLAN of the hot facade queries: no full table scans."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@hbnb.com", "password": "secret"
+        })
+        self.guest = facade.create_user({
+            "first_name": "Guest", "last_name": "User",
+            "email": "guest@hbnb.com", "password": "secret"
+        })
+        self.wifi = facade.create_amenity({"name": "WiFi"})
+        self.place = facade.create_place({
+            "title": "Loft", "price": 90.0, "latitude": 1.0, "longitude": 1.0,
+            "user_id": self.owner.id, "amenities": [self.wifi.id]
+        })
+        facade.create_review({"text": "Nice", "rating": 4,
+                              "user_id": self.guest.id, "place_id": self.place.id})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _plans(self, call):
+        """Run call() and return the query plan of every SELECT it issued."""
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            call()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+
+        self.assertTrue(statements)
+        connection = db.session.connection()
+        return [
+            [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)]
+            for sql, params in statements
+        ]
+
+    def assertIndexed(self, call, allow=()):
+        """
+        No plan step scans a table (subquery scans are fine); `allow` lists the
+        exact SCAN steps expected, e.g. walking an index in ORDER BY order.
+        """
+        for plan in self._plans(call):
+            for step in plan:
+                words = step.split()
+                if words[0] == "SCAN" and words[1] in db.metadata.tables and step not in allow:
+                    self.fail(f"table scan: {step!r} in {plan}")
+
+    def assertNoSort(self, call):
+        """No plan step sorts rows: the index already returns them in page order."""
+        for plan in self._plans(call):
+            for step in plan:
+                if "TEMP B-TREE" in step:
+                    self.fail(f"sort: {step!r} in {plan}")
+
+    def test_reviews_by_place(self):
+        self.assertIndexed(lambda: facade.get_reviews_page(place_id=self.place.id))
+
+    def test_reviews_by_place_pages_in_index_order(self):
+        # the seek (id > cursor) and ORDER BY id both come from (place_id, id)
+        self.assertNoSort(lambda: facade.get_reviews_page(place_id=self.place.id, cursor=0))
+
+    def test_reviews_by_user(self):
+        self.assertIndexed(lambda: facade.get_reviews_page(user_id=self.guest.id))
+
+    def test_has_reviewed(self):
+        self.assertIndexed(lambda: facade.has_reviewed(self.guest.id, self.place.id))
+
+    def test_places_of_user(self):
+        self.assertIndexed(lambda: facade.place_repo.ids_showing_user(self.owner.id))
+
+    def test_places_by_price(self):
+        self.assertIndexed(lambda: facade.get_places_page(min_price=50, max_price=100))
+
+    def test_places_with_amenity(self):
+        self.assertIndexed(lambda: facade.place_repo.ids_with_amenity(self.wifi.id))
+
+    def test_places_by_rating(self):
+        # walks the expression index in order and stops after one page
+        self.assertIndexed(
+            lambda: facade.get_places_page(sort="rating"),
+            allow={"SCAN places USING INDEX ix_places_average_rating"}
+        )
+
+    def test_listing_filtered_by_amenity(self):
+        self.assertIndexed(lambda: facade.get_places_page(amenity_id=self.wifi.id))
+
+    def test_place_search(self):
+        # the FTS5 index answers the MATCH; places are then fetched by primary key
+        self.assertIndexed(lambda: facade.search_places("loft"))
+
+    def test_place_detail(self):
+        self.assertIndexed(lambda: facade.get_place_detail(self.place.id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
-from app import create_app
+from app import create_app, db
+from app.models import serializers
+from app.models.review import Review
+from app.services import facade
 
 
 class TestReviewEndpoints(unittest.TestCase):
@@ -98,6 +101,180 @@ class TestReviewEndpoints(unittest.TestCase):
 
 
 
+class TestReviewListFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@test.com", "password": "secret"
+        })
+        self.guests = [
+            facade.create_user({
+                "first_name": f"Guest{i}", "last_name": "User",
+                "email": f"guest{i}@test.com", "password": "secret"
+            })
+            for i in range(3)
+        ]
+        self.places = [
+            facade.create_place({
+                "title": f"House {i}", "price": 50.0, "latitude": 0.0,
+                "longitude": 0.0, "user_id": owner.id
+            })
+            for i in range(2)
+        ]
+        for place in self.places:
+            for guest in self.guests:
+                facade.create_review({
+                    "text": "Nice", "rating": 4,
+                    "user_id": guest.id, "place_id": place.id
+                })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_filter_by_place(self):
+        """?place_id= returns only that place's reviews"""
+        place_id = self.places[1].id
+        body = self.client.get(f'/api/v1/reviews/?place_id={place_id}').get_json()
+        self.assertEqual(len(body['reviews']), 3)
+        self.assertTrue(all(r['place_id'] == place_id for r in body['reviews']))
+        self.assertIsNone(body['next_cursor'])
+
+    def test_filter_by_user_paginated(self):
+        """?user_id= combined with limit/cursor pages through the author's reviews"""
+        user_id = self.guests[0].id
+        first = self.client.get(f'/api/v1/reviews/?user_id={user_id}&limit=1').get_json()
+        self.assertEqual(len(first['reviews']), 1)
+
+        cursor = first['next_cursor']
+        second = self.client.get(f'/api/v1/reviews/?user_id={user_id}&limit=1&cursor={cursor}').get_json()
+        self.assertEqual(len(second['reviews']), 1)
+        self.assertIsNone(second['next_cursor'])
+        self.assertNotEqual(first['reviews'][0]['id'], second['reviews'][0]['id'])
+
+    def test_projected_page(self):
+        """columns= pages through plain rows; the id needed for the cursor is always selected"""
+        place_id = self.places[0].id
+        rows, next_cursor = facade.get_reviews_page(limit=2, place_id=place_id, columns=("rating",))
+        self.assertEqual([tuple(row._fields) for row in rows], [("id", "rating")] * 2)
+        self.assertEqual(next_cursor, rows[-1].id)
+
+    def test_serializer_takes_objects_and_rows(self):
+        """The list (projected rows) and the detail (ORM object) serialize reviews identically"""
+        listed = self.client.get(f'/api/v1/reviews/?place_id={self.places[0].id}').get_json()['reviews']
+        detail = self.client.get(f"/api/v1/reviews/{listed[0]['id']}").get_json()
+        self.assertEqual(detail, listed[0])
+        self.assertEqual(list(detail), list(serializers.REVIEW.fields))
+
+    def test_serializers_are_compiled_once(self):
+        self.assertIs(serializers.compile_serializer(Review, serializers.REVIEW.fields),
+                      serializers.REVIEW)
+        with self.assertRaises(ValueError):
+            serializers.compile_serializer(Review, ("id", "__class__"))
+
+    def test_has_reviewed(self):
+        """has_reviewed answers from the (user_id, place_id) index"""
+        new_place = facade.create_place({
+            "title": "Unreviewed", "price": 50.0, "latitude": 0.0,
+            "longitude": 0.0, "user_id": self.guests[1].id
+        })
+        self.assertTrue(facade.has_reviewed(self.guests[0].id, self.places[0].id))
+        self.assertFalse(facade.has_reviewed(self.guests[0].id, new_place.id))
+
+    def test_duplicate_review_rejected(self):
+        """The unique constraint turns a second review into a ValueError"""
+        with self.assertRaises(ValueError):
+            facade.create_review({
+                "text": "Again", "rating": 1,
+                "user_id": self.guests[0].id, "place_id": self.places[0].id
+            })
+        # session is still usable after the rollback
+        self.assertEqual(len(facade.get_all_reviews()), 6)
+
+    def test_conditional_get(self):
+        """GET /reviews/<id> honours If-None-Match until the review changes"""
+        review_id = facade.get_all_reviews()[0].id
+        etag = self.client.get(f'/api/v1/reviews/{review_id}').headers['ETag']
+
+        resp = self.client.get(f'/api/v1/reviews/{review_id}', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 304)
+
+        facade.update_review(review_id, {"text": "Changed my mind"})
+        resp = self.client.get(f'/api/v1/reviews/{review_id}', headers={'If-None-Match': etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()['text'], "Changed my mind")
+
+
+class TestReviewBulkCreate(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        owner = facade.create_user({
+            "first_name": "Owner", "last_name": "User",
+            "email": "owner@test.com", "password": "secret"
+        })
+        self.guest = facade.create_user({
+            "first_name": "Guest", "last_name": "User",
+            "email": "guest@test.com", "password": "secret"
+        })
+        self.places = [
+            facade.create_place({
+                "title": f"House {i}", "price": 50.0, "latitude": 0.0,
+                "longitude": 0.0, "user_id": owner.id
+            })
+            for i in range(3)
+        ]
+        facade.create_review({
+            "text": "Been there", "rating": 3,
+            "user_id": self.guest.id, "place_id": self.places[2].id
+        })
+        token = self.client.post('/api/v1/auth/login', json={
+            "email": "guest@test.com", "password": "secret"
+        }).get_json()['access_token']
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_bulk_reviews_update_aggregates(self):
+        """Duplicates (in the DB or in the batch) fail per item; aggregates follow the inserts"""
+        p0, p1, p2 = (p.id for p in self.places)
+        resp = self.client.post('/api/v1/reviews/bulk', headers=self.headers, json=[
+            {"text": "Great", "rating": 5, "place_id": p0},
+            {"text": "Again", "rating": 1, "place_id": p0},
+            {"text": "Fine", "rating": 4, "place_id": p1},
+            {"text": "Twice", "rating": 2, "place_id": p2},
+            {"text": "Nowhere", "rating": 2, "place_id": 999},
+        ])
+        self.assertEqual(resp.status_code, 201)
+        results = resp.get_json()['results']
+        self.assertEqual(['id' in r for r in results], [True, False, True, False, False])
+        self.assertEqual(results[1]['error'], "You have already reviewed this place")
+        self.assertEqual(results[4]['error'], "Place not found")
+
+        db.session.expire_all()
+        self.assertEqual((facade.get_place(p0).review_count, facade.get_place(p0).rating_sum), (1, 5))
+        self.assertEqual(facade.get_place(p1).average_rating, 4.0)
+        self.assertEqual(facade.get_place(p2).review_count, 1)
+
+        detail = self.client.get(f'/api/v1/places/{p0}').get_json()
+        self.assertEqual(len(detail['reviews']), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,9 @@
+import json
 import unittest
-from app import create_app
+from app import create_app, db
+from flask_jwt_extended import create_access_token
+from app.services import facade
+from app.services.rate_limiter import MemoryRateLimiter
 
 
 class TestUserEndpoints(unittest.TestCase):
@@ -83,5 +87,244 @@ class TestUserEndpoints(unittest.TestCase):
         self.assertEqual(verify_resp.json['first_name'], "John")
 
 
+class TestPasswordHashing(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.user = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane@example.com", "password": "secret"
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _login(self):
+        return self.client.post('/api/v1/auth/login', json={
+            "email": "jane@example.com", "password": "secret"
+        })
+
+    def test_hash_uses_configured_rounds(self):
+        """BCRYPT_LOG_ROUNDS sets the cost of new hashes"""
+        self.assertTrue(self.user.password.startswith("$2b$04$"))
+        self.assertFalse(self.user.password_needs_rehash())
+
+    def test_login_rehashes_on_cost_change(self):
+        """A successful login upgrades a hash made with another cost"""
+        self.app.config["BCRYPT_LOG_ROUNDS"] = 5
+        self.assertTrue(self.user.password_needs_rehash())
+
+        self.assertEqual(self._login().status_code, 200)
+        self.assertTrue(facade.get_user(self.user.id).password.startswith("$2b$05$"))
+        self.assertEqual(self._login().status_code, 200)
+
+    def test_thread_executor(self):
+        """Hashing can be offloaded to a worker pool"""
+        self.app.config["PASSWORD_HASH_EXECUTOR"] = "thread"
+        self.app.extensions.pop("hbnb_password_executor", None)
+
+        self.assertEqual(self._login().status_code, 200)
+        self.assertIsNotNone(self.app.extensions["hbnb_password_executor"])
+        self.app.extensions["hbnb_password_executor"].shutdown()
+
+
+class TestLoginThrottle(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app.config["LOGIN_FAILURE_LIMIT"] = (3, 300)
+        self.app.config["LOGIN_IP_LIMIT"] = (6, 60)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.jane = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane@example.com", "password": "secret"
+        })
+        admin = facade.create_user({
+            "first_name": "Admin", "last_name": "User",
+            "email": "admin@example.com", "password": "secret", "is_admin": True
+        })
+        # minted directly: logging in would move the counters under test
+        self.admin_headers = self._headers(admin)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _headers(self, user):
+        token = create_access_token(identity=str(user.id), additional_claims={
+            "is_admin": bool(user.is_admin), "ver": user.token_version
+        })
+        return {"Authorization": f"Bearer {token}"}
+
+    def _login(self, password, email="jane@example.com"):
+        return self.client.post('/api/v1/auth/login', json={"email": email, "password": password})
+
+    def test_stats_require_an_admin(self):
+        """/stats exposes throttle counters: admins only"""
+        self.assertEqual(self.client.get('/stats').status_code, 401)
+        self.assertEqual(self.client.get('/stats', headers=self._headers(self.jane)).status_code, 403)
+        self.assertEqual(self.client.get('/stats', headers=self.admin_headers).status_code, 200)
+
+    def test_failures_lock_the_email(self):
+        """Repeated bad passwords get 429 without reaching bcrypt"""
+        for _ in range(3):
+            self.assertEqual(self._login("wrong").status_code, 401)
+
+        resp = self._login("secret")
+        self.assertEqual(resp.status_code, 429)
+        self.assertIn('Retry-After', resp.headers)
+
+        stats = self.client.get('/stats', headers=self.admin_headers).get_json()['login']
+        self.assertEqual(stats['verified'], 3)
+        self.assertEqual(stats['rejected'], 1)
+
+    def test_memory_limiter_caps_its_keys(self):
+        """Partly drained buckets for ever-new keys evict the least recently hit one"""
+        limiter = MemoryRateLimiter(max_keys=3)
+        for key in ("a", "b", "c"):
+            limiter.hit(key, 5, 300)
+        limiter.hit("a", 5, 300)  # "b" is now the least recently hit
+        limiter.hit("d", 5, 300)
+        self.assertEqual(list(limiter._buckets), ["c", "a", "d"])
+
+    def test_success_resets_failures(self):
+        """A good password clears the failure count"""
+        self._login("wrong")
+        self._login("wrong")
+        self.assertEqual(self._login("secret").status_code, 200)
+        self.assertEqual(self._login("wrong").status_code, 401)
+        self.assertEqual(self._login("wrong").status_code, 401)
+
+    def test_ip_limit(self):
+        """One IP spraying many emails is throttled"""
+        codes = [self._login("x", email=f"user{i}@example.com").status_code for i in range(7)]
+        self.assertEqual(codes, [401] * 6 + [429])
+
+
+
+class TestTokenRevocation(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.user = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane@example.com", "password": "secret"
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _headers(self):
+        resp = self.client.post('/api/v1/auth/login',
+                                json={"email": "jane@example.com", "password": "secret"})
+        return {"Authorization": f"Bearer {resp.get_json()['access_token']}"}
+
+    def test_authorization_needs_no_queries(self):
+        """A protected request is authorized from the token and the in-memory version map"""
+        from sqlalchemy import event
+
+        headers = self._headers()
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            resp = self.client.get('/api/v1/users/protected', headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(statements, [])
+
+    def test_privilege_change_revokes_tokens(self):
+        """Changing is_admin, email or password invalidates previously issued tokens"""
+        headers = self._headers()
+        facade.update_user(self.user.id, {"is_admin": True})
+        self.assertEqual(self.client.get('/api/v1/users/protected', headers=headers).status_code, 401)
+        self.assertEqual(
+            self.client.get('/api/v1/users/protected', headers=self._headers()).status_code, 200
+        )
+
+    def test_profile_change_keeps_tokens(self):
+        """Name changes do not log the user out"""
+        headers = self._headers()
+        facade.update_user(self.user.id, {"first_name": "Janet"})
+        self.assertEqual(self.client.get('/api/v1/users/protected', headers=headers).status_code, 200)
+
+
+
+class TestUserListProjection(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane@example.com", "password": "secret"
+        })
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_list_selects_only_listed_columns(self):
+        """The user list never loads password hashes or builds User objects"""
+        from sqlalchemy import event
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            resp = self.client.get('/api/v1/users/')
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), [{"id": 1, "first_name": "Jane", "last_name": "Doe"}])
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn("password", statements[0])
+        self.assertEqual(len(db.session.identity_map), 0)
+
+    def test_stream_users(self):
+        """?stream=ndjson sends the same rows as the list, one per line"""
+        facade.create_user({
+            "first_name": "John", "last_name": "Roe",
+            "email": "john@example.com", "password": "secret"
+        })
+        resp = self.client.get('/api/v1/users/?stream=ndjson')
+        self.assertEqual(resp.status_code, 200)
+        lines = resp.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines],
+                         self.client.get('/api/v1/users/').get_json())
+
+    def test_unknown_column_is_rejected(self):
+        with self.assertRaises(ValueError):
+            facade.get_all_users(columns=("id", "places"))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file